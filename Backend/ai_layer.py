@@ -17,6 +17,8 @@ from typing import Any
 
 import requests
 
+from figures import months_of_runway
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -105,9 +107,37 @@ def _call_granite(prompt: str, max_tokens: int = 1500) -> str:
 
 # ── Public helpers ────────────────────────────────────────────────────
 
-def _fmt_currency(val: float) -> str:
-    """Format a number as $X,XXX."""
-    return f"${val:,.0f}"
+def _recurring_section(recurring: dict[str, Any] | None, limit: int = 15) -> str:
+    """Prompt block listing the largest active recurring vendors, or ''."""
+    if not recurring:
+        return ""
+    vendors = [
+        {k: s[k] for k in ("vendor", "category", "cadence", "monthly_cost")}
+        for s in recurring.get("subscriptions", [])
+        if s.get("active")
+    ][:limit]
+    if not vendors:
+        return ""
+    return f"""
+=== RECURRING VENDORS (monthly-equivalent cost) ===
+{json.dumps(vendors, indent=2)}
+"""
+
+
+def _headcount_section(headcount: dict[str, Any] | None) -> str:
+    """Prompt block listing the planned hires behind the payroll in burn, or ''."""
+    if not headcount or not headcount.get("roles"):
+        return ""
+    roles = [
+        {k: r[k] for k in ("title", "department", "count", "start_month", "monthly_cost")}
+        for r in headcount["roles"]
+    ]
+    return f"""
+=== PLANNED HIRES (start month 0 = next month; monthly_cost is fully loaded) ===
+Monthly burn above includes ${headcount["avg_monthly_payroll"]:,.0f}/month of planned payroll
+averaged over the next {headcount["horizon"]} months.
+{json.dumps(roles, indent=2)}
+"""
 
 
 def _top_expense(expenses: list[dict]) -> str:
@@ -163,6 +193,7 @@ Summary:"""
 def generate_board_report(
     metrics: dict[str, Any],
     optimization: dict[str, Any],
+    headcount: dict[str, Any] | None = None,
 ) -> str:
     """
     Generate a full executive board memo from financial metrics and an
@@ -174,6 +205,9 @@ def generate_board_report(
         Output of ``financial_engine.compute_metrics``.
     optimization : dict
         Output of ``optimizer.optimize``.
+    headcount : dict, optional
+        Hiring plan (``headcount.build_headcount_plan``) whose payroll
+        *metrics* and *optimization* already include.
 
     Returns
     -------
@@ -189,7 +223,7 @@ provided.
 
 === OPTIMIZATION PLAN ===
 {json.dumps(optimization, indent=2)}
-
+{_headcount_section(headcount)}
 Format the report with these EXACT section headers (use markdown ##):
 
 ## Executive Summary
@@ -228,7 +262,11 @@ Report:"""
 #  ask_cfo_question
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def ask_cfo_question(question: str, metrics: dict[str, Any]) -> str:
+def ask_cfo_question(
+    question: str,
+    metrics: dict[str, Any],
+    recurring: dict[str, Any] | None = None,
+) -> str:
     """
     Answer a user's financial question as if you were their CFO.
 
@@ -238,6 +276,9 @@ def ask_cfo_question(question: str, metrics: dict[str, Any]) -> str:
         The user's question (e.g. "Can we hire two engineers next month?")
     metrics : dict
         Structured JSON from ``financial_engine.compute_metrics``.
+    recurring : dict, optional
+        Output of ``recurring.detect_recurring``; lets the answer name
+        specific vendors.
 
     Returns
     -------
@@ -251,7 +292,7 @@ on burn rate and runway.
 
 === CURRENT FINANCIAL DATA ===
 {json.dumps(metrics, indent=2)}
-
+{_recurring_section(recurring)}
 === USER QUESTION ===
 {question}
 
@@ -275,11 +316,17 @@ Answer:"""
 def generate_ai_optimization(
     metrics: dict[str, Any],
     cash_balance: float,
+    recurring: dict[str, Any] | None = None,
+    headcount: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     """
     Have IBM Granite generate a full, creative optimization plan based
     on the current financial data. No target months required — the AI
     analyses the full picture and recommends the best optimizations.
+    When *recurring* vendors are supplied, the plan may target them by
+    name; when a *headcount* plan is supplied, *metrics* must already
+    include its payroll (``headcount.with_planned_payroll``) and the
+    plan may defer the listed hires.
 
     Returns a structured dict with plan actions, reasoning, and projected
     numbers — or raises RuntimeError if the AI call fails.
@@ -298,7 +345,7 @@ Total expenses: ${total_expenses:,.0f}
 
 === EXPENSE BREAKDOWN ===
 {json.dumps(metrics.get("expenses", []), indent=2)}
-
+{_recurring_section(recurring)}{_headcount_section(headcount)}
 === YOUR TASK ===
 Analyse ALL expenses and create the best optimization plan to reduce costs and
 extend runway as much as possible. Focus on the highest-impact, lowest-risk
@@ -339,6 +386,8 @@ Rules:
 - monthly_savings_est for each action must be realistic and proportional to the actual category spend.
 - Total savings should aim for 15-30% of current burn — aggressive but achievable.
 - Reference the ACTUAL expense categories and amounts from the data above.
+- If recurring vendors are listed, target specific vendors by name where it makes sense; savings for a vendor must not exceed its monthly cost.
+- If planned hires are listed, deferring one saves at most its monthly_cost per month of delay.
 - Be creative but realistic. A real CFO would approve these.
 - Output ONLY valid JSON — no markdown, no explanation before/after.
 
@@ -370,7 +419,7 @@ JSON:"""
     actions = ai_plan.get("plan", [])
     total_savings = sum(a.get("monthly_savings_est", 0) for a in actions)
     new_burn = current_burn - total_savings
-    new_runway = round(cash_balance / new_burn, 2) if new_burn > 0 else None
+    new_runway = months_of_runway(cash_balance, new_burn)
 
     return {
         "current_runway": current_runway,
@@ -2,41 +2,56 @@
 anomaly_detector.py – Detects unusual spending spikes using z-score analysis.
 """
 
-from typing import Any
+from typing import Any, Optional
 import pandas as pd
 import numpy as np
 
+from baseline import latest_z_scores
+from portfolio import build_aggregates
 
-def detect_anomalies(df: pd.DataFrame, threshold: float = 1.5) -> dict[str, Any]:
+
+def detect_anomalies(
+    df: pd.DataFrame,
+    threshold: float = 1.5,
+    baseline: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
     """
     Detect anomalous spending by category using z-score on monthly totals.
 
+    Each category's latest month is scored against its fitted baseline
+    (see ``baseline.fit_baseline``): seasonal expectation when there is
+    enough history, otherwise the all-time mean and std.  Pass a cached
+    *baseline* to skip refitting.
+
     Returns a dict with alerts and per-category analysis.
     """
-    expenses = df[df["amount"] < 0].copy()
-    expenses["abs_amount"] = expenses["amount"].abs()
+    if baseline is None:
+        baseline = build_aggregates(df)["baseline"]
+
+    z_all = latest_z_scores(baseline)
+    col = {cat: i for i, cat in enumerate(baseline["categories"])}
 
     alerts: list[dict] = []
     category_analysis: list[dict] = []
 
-    for cat in expenses["category"].unique():
-        cat_data = expenses[expenses["category"] == cat]
-        monthly = cat_data.groupby("month")["abs_amount"].sum().sort_index()
+    basis = "expected" if baseline["method"] == "seasonal" else "avg"
 
-        if len(monthly) < 2:
+    for cat in pd.unique(df.loc[df["amount"] < 0, "category"]):
+        i = col[str(cat)]
+        if baseline["count"][i] < 2:
             continue
 
-        mean_val = float(monthly.mean())
-        std_val = float(monthly.std())
-        latest_month = monthly.index[-1]
-        latest_val = float(monthly.iloc[-1])
-
-        # z-score for the latest month
-        z = (latest_val - mean_val) / std_val if std_val > 0 else 0
+        mean_val = float(baseline["mean"][i])
+        expected = float(baseline["expected"][i])
+        std_val = float(baseline["scale"][i])
+        latest_month = baseline["months"][baseline["latest_idx"][i]]
+        latest_val = float(baseline["latest"][i])
+        z = float(z_all[i])
 
         cat_info = {
             "category": str(cat),
             "monthly_avg": round(mean_val, 2),
+            "expected": round(expected, 2),
             "latest_month": str(latest_month),
             "latest_amount": round(latest_val, 2),
             "std_dev": round(std_val, 2),
@@ -46,13 +61,13 @@ def detect_anomalies(df: pd.DataFrame, threshold: float = 1.5) -> dict[str, Any]
         category_analysis.append(cat_info)
 
         if abs(z) > threshold:
-            pct_change = ((latest_val - mean_val) / mean_val * 100) if mean_val > 0 else 0
+            pct_change = ((latest_val - expected) / expected * 100) if expected > 0 else 0
             direction = "increase" if z > 0 else "decrease"
             alerts.append({
                 "category": str(cat),
                 "severity": "high" if abs(z) > 2.5 else "medium",
-                "message": f"{cat} spending {direction} detected: ${latest_val:,.0f} vs avg ${mean_val:,.0f} ({pct_change:+.0f}%)",
-                "normal_avg": round(mean_val, 2),
+                "message": f"{cat} spending {direction} detected: ${latest_val:,.0f} vs {basis} ${expected:,.0f} ({pct_change:+.0f}%)",
+                "normal_avg": round(expected, 2),
                 "current": round(latest_val, 2),
                 "pct_change": round(pct_change, 1),
                 "z_score": round(z, 2),
@@ -63,6 +78,7 @@ def detect_anomalies(df: pd.DataFrame, threshold: float = 1.5) -> dict[str, Any]
 
     return {
         "alerts": alerts,
+        "baseline_method": baseline["method"],
         "categories_analyzed": len(category_analysis),
         "anomalies_found": len(alerts),
         "category_analysis": category_analysis,
@@ -0,0 +1,233 @@
+"""
+baseline.py – Per-category expected spend with seasonality.
+
+Fits every category of the month × category matrix at once:
+
+* ``seasonal`` (36+ months: two full years after the 12-month trend
+  warm-up): trailing 12-month mean as the trend, plus a month-of-year
+  index averaged over all years.  Each calendar month's effect is
+  shrunk by how consistent it is (empirical Bayes): a renewal or bonus
+  that repeats every year is kept whole, while month-to-month noise is
+  pulled to zero.  The scale is the pooled within-calendar-month spread,
+  floored at a share of the category's typical spend.
+* ``level`` (shorter histories): mean and standard deviation over the
+  months a category was actually billed — the original z-score rule.
+
+The fitted baseline feeds both anomaly scoring and cash forecasting.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from headcount import payroll_path
+
+SEASON = 12
+SEASONAL_MIN_MONTHS = 36
+
+# Scale never drops below this share of a category's mean billed month,
+# so a perfectly regular charge is not flagged over rounding noise
+SCALE_FLOOR = 0.1
+
+
+def _masked_stats(values: np.ndarray, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-column count, mean and sample std over the masked rows."""
+    n = mask.sum(axis=0)
+    mean = np.where(mask, values, 0.0).sum(axis=0) / np.maximum(n, 1)
+    sq = np.where(mask, (values - mean) ** 2, 0.0).sum(axis=0)
+    std = np.sqrt(sq / np.maximum(n - 1, 1))
+    return n, mean, std
+
+
+def _seasonal_index(
+    values: np.ndarray,
+    moy: np.ndarray,
+    exclude: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Trailing-trend and month-of-year index for every column.
+
+    Cells flagged in *exclude* (e.g. the month being scored) are left
+    out of the seasonal averages.
+
+    Returns
+    -------
+    trend : (T, C) trailing 12-month mean, excluding the current month
+    seasonal : (12, C) shrunk mean deviation from trend per calendar
+        month, centred so it sums to zero over the year
+    scale : (12, C) standard error of predicting a new month from its
+        calendar-month mean
+    """
+    frame = pd.DataFrame(values)
+    trend = frame.rolling(SEASON, min_periods=SEASON).mean().shift(1).to_numpy()
+    detrended = values - trend
+    if exclude is not None:
+        detrended[exclude] = np.nan
+
+    # Per (calendar month, column) sums and counts in one pass
+    used = ~np.isnan(detrended)
+    filled = np.where(used, detrended, 0.0)
+    onehot = np.eye(SEASON)[moy]  # (T, 12)
+    counts = onehot.T @ used.astype(float)
+    means = np.divide(onehot.T @ filled, counts, out=np.zeros_like(counts), where=counts > 0)
+
+    # Noise: pooled spread around each calendar month's own mean
+    dev = np.where(used, detrended - means[moy], 0.0)
+    dof = used.sum(axis=0) - (counts > 0).sum(axis=0)
+    noise = np.divide((dev ** 2).sum(axis=0), dof, out=np.zeros(values.shape[1]), where=dof > 0)
+
+    # Signal: spread of the month means beyond what noise explains
+    seen = counts > 0
+    n_seen = np.maximum(seen.sum(axis=0), 1)
+    grand = means.sum(axis=0) / n_seen
+    n = np.maximum(counts, 1)
+    spread = np.where(seen, (means - grand) ** 2, 0.0).sum(axis=0) / np.maximum(n_seen - 1, 1)
+    signal = np.maximum(spread - np.where(seen, noise / n, 0.0).sum(axis=0) / n_seen, 0.0)
+
+    # Consistent months (noise ≪ signal) keep their full effect
+    weight = np.divide(signal, signal + noise / n, out=np.ones_like(means), where=signal + noise > 0)
+    seasonal = np.where(seen, grand + weight * (means - grand), grand)
+    seasonal -= seasonal.mean(axis=0)
+
+    scale = np.sqrt(noise * (1 + 1 / n))
+    return trend, seasonal, scale
+
+
+def fit_baseline(
+    months: list[str],
+    categories: list[str],
+    expense: np.ndarray,
+    revenue: np.ndarray,
+    observed: np.ndarray,
+) -> dict[str, Any]:
+    """
+    Fit expected spend for every category in one pass.
+
+    Parameters
+    ----------
+    months : list[str]       Dense, consecutive YYYY-MM labels (rows).
+    categories : list[str]   Column labels.
+    expense, revenue : np.ndarray
+        (months × categories) positive magnitudes, zero-filled.
+    observed : np.ndarray    Bool per month: any transactions at all.
+
+    Returns
+    -------
+    dict with the method, per-category latest-month scoring arrays
+    (``latest_idx``, ``latest``, ``expected``, ``scale``, ``count``,
+    ``mean``) and forecast components (``level``/``seasonal`` for
+    expense and revenue).
+    """
+    moy = pd.PeriodIndex(months, freq="M").month.to_numpy() - 1
+    present = expense > 0
+    count, mean, std = _masked_stats(expense, present)
+
+    cols = np.arange(expense.shape[1])
+    latest_idx = len(months) - 1 - np.argmax(present[::-1], axis=0)
+    latest = expense[latest_idx, cols]
+
+    seasonal_fit = len(months) >= SEASONAL_MIN_MONTHS
+    if seasonal_fit:
+        # The scored month must not shape its own expectation or band
+        scored = np.zeros_like(present)
+        scored[latest_idx, cols] = True
+        trend, seasonal, month_scale = _seasonal_index(expense, moy, exclude=scored)
+        _, rev_seasonal, _ = _seasonal_index(revenue, moy)
+
+        scale = np.maximum(month_scale[moy[latest_idx], cols], SCALE_FLOOR * mean)
+        expected = trend[latest_idx, cols] + seasonal[moy[latest_idx], cols]
+
+        level = expense[-SEASON:].mean(axis=0)
+        rev_level = revenue[-SEASON:].mean(axis=0)
+    else:
+        seasonal = np.zeros((SEASON, expense.shape[1]))
+        rev_seasonal = np.zeros((SEASON, revenue.shape[1]))
+        scale = std
+        expected = mean
+
+        n_obs = max(int(observed.sum()), 1)
+        level = expense[observed].sum(axis=0) / n_obs
+        rev_level = revenue[observed].sum(axis=0) / n_obs
+
+    return {
+        "method": "seasonal" if seasonal_fit else "level",
+        "months": list(months),
+        "categories": list(categories),
+        "latest_idx": latest_idx,
+        "latest": latest,
+        "expected": expected,
+        "scale": np.nan_to_num(scale),
+        "count": count,
+        "mean": mean,
+        "expense_level": level,
+        "expense_seasonal": seasonal,
+        "revenue_level": rev_level,
+        "revenue_seasonal": rev_seasonal,
+    }
+
+
+def latest_z_scores(baseline: dict[str, Any]) -> np.ndarray:
+    """z-score of each category's latest billed month against its baseline."""
+    scale = baseline["scale"]
+    diff = baseline["latest"] - baseline["expected"]
+    z = np.divide(diff, scale, out=np.zeros_like(diff, dtype=float), where=scale > 0)
+    return np.where(baseline["count"] >= 2, z, 0.0)
+
+
+def path_runway(cash_balance: float, net: np.ndarray) -> Optional[float]:
+    """
+    Fractional month in which cash first reaches zero under the monthly
+    net burn path *net*, or None if it never does within the path.
+    """
+    cash = cash_balance - np.cumsum(net)
+    below = np.flatnonzero(cash <= 0)
+    if not len(below):
+        return None
+    i = int(below[0])
+    before = cash_balance if i == 0 else cash[i - 1]
+    return round(i + before / net[i], 2)
+
+
+def forecast_cash(
+    baseline: dict[str, Any],
+    cash_balance: float,
+    horizon: int = 24,
+    headcount: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """
+    Project monthly expense, revenue, net burn and cash from the baseline.
+
+    A *headcount* plan's payroll is added to projected expense month by
+    month (and reported as ``planned_payroll``).
+
+    Returns
+    -------
+    dict with ``months`` and aligned ``expense``, ``revenue``,
+    ``net_burn`` and ``cash`` lists, plus ``runway_months`` (fractional
+    month cash crosses zero, None if it never does within *horizon*).
+    """
+    last = pd.Period(baseline["months"][-1], freq="M")
+    future = pd.period_range(last + 1, periods=horizon, freq="M")
+    moy = future.month.to_numpy() - 1
+
+    expense = np.clip(baseline["expense_level"] + baseline["expense_seasonal"][moy], 0, None).sum(axis=1)
+    revenue = np.clip(baseline["revenue_level"] + baseline["revenue_seasonal"][moy], 0, None).sum(axis=1)
+    if headcount is not None:
+        payroll = payroll_path(headcount, horizon)
+        expense = expense + payroll
+    net = expense - revenue
+    cash = cash_balance - np.cumsum(net)
+
+    result = {
+        "method": baseline["method"],
+        "months": [str(m) for m in future],
+        "expense": np.round(expense, 2).tolist(),
+        "revenue": np.round(revenue, 2).tolist(),
+        "net_burn": np.round(net, 2).tolist(),
+        "cash": np.round(cash, 2).tolist(),
+        "runway_months": path_runway(cash_balance, net),
+    }
+    if headcount is not None:
+        result["planned_payroll"] = np.round(payroll, 2).tolist()
+    return result
@@ -0,0 +1,88 @@
+"""
+bench_startup.py – Time to first healthy response of the API process.
+
+Starts ``uvicorn main:app`` in each startup mode, polls ``/health`` until
+it answers, then times the first ``/upload`` + ``/metrics`` round trip
+(the request that pays any import cost the warm-up has not covered).
+
+    python bench_startup.py [--runs 5] [--port 8765]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SAMPLE = HERE / "sample_finances.csv"
+
+
+def _get(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=30) as resp:
+        return resp.read()
+
+
+def _upload(base: str) -> None:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"s.csv\"\r\n"
+        f"Content-Type: text/csv\r\n\r\n"
+    ).encode() + SAMPLE.read_bytes() + f"\r\n--{boundary}--\r\n".encode()
+    req = urllib.request.Request(
+        f"{base}/upload", data=body, headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    )
+    urllib.request.urlopen(req, timeout=30).read()
+
+
+def run_once(mode: str, port: int) -> tuple[float, float]:
+    """(ms to first healthy /health, ms for first upload + metrics)."""
+    env = {**os.environ, "STARTUP_MODE": mode}
+    env.pop("SNAPSHOT_DIR", None)
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                _get(f"{base}/health")
+                break
+            except OSError:
+                if proc.poll() is not None:
+                    raise RuntimeError("server exited during startup")
+                time.sleep(0.005)
+        healthy = (time.perf_counter() - start) * 1000
+
+        t = time.perf_counter()
+        _upload(base)
+        _get(f"{base}/metrics")
+        first = (time.perf_counter() - t) * 1000
+    finally:
+        proc.terminate()
+        proc.wait()
+    return healthy, first
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'first healthy (ms)':>22}{'first upload+metrics (ms)':>28}")
+    for mode in ("eager", "lazy"):
+        results = [run_once(mode, args.port) for _ in range(args.runs)]
+        healthy = statistics.median(r[0] for r in results)
+        first = statistics.median(r[1] for r in results)
+        print(f"{mode:<8}{healthy:>22.0f}{first:>28.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+classifier.py – Rule-based category classification for uploaded ledgers.
+
+Rules match the raw ``category`` or ``notes`` text by exact value, prefix,
+whole-word keyword or regular expression (all case-insensitive).
+Consecutive exact/prefix/keyword rules for a field are escaped into one
+alternation, so a run of them is tested in a single regex call; regex
+rules are compiled on their own, so their inline flags and
+backreferences keep their meaning.  Rule order is priority order.  Work
+is done once per distinct (category, notes) pair, never per row.
+"""
+
+import re
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+MATCH_TYPES = ("exact", "prefix", "keyword", "regex")
+FIELDS = ("category", "notes")
+
+FALLBACK_RULE = "fallback:title"
+BLANK_RULE = "fallback:blank"
+
+_MEMO_LIMIT = 100_000
+_FLAGS = re.IGNORECASE | re.DOTALL
+
+
+def _fragment(match: str, pattern: str) -> str:
+    """Escaped regex source for a literal rule, anchored at the start of the value."""
+    if match == "exact":
+        return re.escape(pattern.strip()) + r"\Z"
+    if match == "prefix":
+        return re.escape(pattern.strip())
+    return r".*?\b" + re.escape(pattern.strip()) + r"\b"
+
+
+class CategoryClassifier:
+    """
+    Compiled, memoised category matcher.
+
+    Parameters
+    ----------
+    rules : list of dict
+        Each rule has ``match`` (exact | prefix | keyword | regex),
+        ``pattern``, ``category`` (canonical output), and optionally
+        ``field`` (category | notes, default category) and ``id``.
+
+    Raises
+    ------
+    ValueError  on an unknown match type/field or an invalid regex.
+    """
+
+    def __init__(self, rules: list[dict[str, Any]]):
+        self._source = list(rules)
+        self.rules: list[dict[str, str]] = []
+        # Per field, in rule order: (alternation, None) for a run of literal
+        # rules (named groups give the rule) or (regex, rule index)
+        self._matchers: dict[str, list[tuple[re.Pattern, Optional[int]]]] = {f: [] for f in FIELDS}
+        pending: dict[str, list[str]] = {f: [] for f in FIELDS}
+
+        def flush(field: str) -> None:
+            if pending[field]:
+                self._matchers[field].append((re.compile("|".join(pending[field]), _FLAGS), None))
+                pending[field] = []
+
+        for i, rule in enumerate(rules):
+            match = rule.get("match", "exact")
+            field = rule.get("field", "category")
+            pattern = str(rule.get("pattern", ""))
+            if match not in MATCH_TYPES:
+                raise ValueError(f"Rule {i}: match must be one of {', '.join(MATCH_TYPES)}.")
+            if field not in FIELDS:
+                raise ValueError(f"Rule {i}: field must be one of {', '.join(FIELDS)}.")
+            if not pattern.strip() or not str(rule.get("category", "")).strip():
+                raise ValueError(f"Rule {i}: pattern and category are required.")
+            if match == "regex":
+                try:
+                    compiled = re.compile(pattern, _FLAGS)
+                except re.error as exc:
+                    raise ValueError(f"Rule {i}: invalid regex: {exc}")
+                flush(field)
+                self._matchers[field].append((compiled, i))
+            else:
+                pending[field].append(f"(?P<_rule{i}>{_fragment(match, pattern)})")
+
+            self.rules.append(
+                {
+                    "id": str(rule.get("id") or f"{match}:{field}:{pattern}"),
+                    "category": str(rule["category"]).strip(),
+                }
+            )
+
+        for field in FIELDS:
+            flush(field)
+        self._memo: dict[tuple[str, str], tuple[str, str]] = {}
+
+    @classmethod
+    def from_map(cls, mapping: dict[str, str]) -> "CategoryClassifier":
+        """Exact-match classifier from an alias → canonical dict."""
+        return cls(
+            [
+                {"match": "exact", "pattern": alias, "category": canon, "id": f"builtin:{alias}"}
+                for alias, canon in mapping.items()
+            ]
+        )
+
+    def extend(self, other: "CategoryClassifier") -> "CategoryClassifier":
+        """New classifier with this one's rules first, then *other*'s."""
+        return CategoryClassifier(self._source + other._source)
+
+    @property
+    def uses_notes(self) -> bool:
+        return bool(self._matchers["notes"])
+
+    # ── Single value ─────────────────────────────────────────────────
+    def _first_rule(self, field: str, text: str) -> Optional[int]:
+        if not text:
+            return None
+        for pattern, rule in self._matchers[field]:
+            if rule is None:
+                m = pattern.match(text)
+                if m:
+                    return int(m.lastgroup[len("_rule"):])
+            elif pattern.search(text):
+                return rule
+        return None
+
+    def classify_one(self, raw_category: str, raw_notes: str = "") -> tuple[str, str]:
+        """Return ``(canonical_category, rule_id)`` for one raw value."""
+        key = (raw_category, raw_notes)
+        hit = self._memo.get(key)
+        if hit is not None:
+            return hit
+
+        cleaned = raw_category.strip()
+        hits = [
+            r for r in (
+                self._first_rule("category", cleaned),
+                self._first_rule("notes", raw_notes.strip()),
+            )
+            if r is not None
+        ]
+        if hits:
+            rule = self.rules[min(hits)]
+            result = (rule["category"], rule["id"])
+        elif not cleaned:
+            result = ("Other", BLANK_RULE)
+        else:
+            result = (cleaned.title(), FALLBACK_RULE)
+
+        if len(self._memo) >= _MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[key] = result
+        return result
+
+    # ── Vectorised ───────────────────────────────────────────────────
+    def classify(
+        self,
+        categories: pd.Series,
+        notes: Optional[pd.Series] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Classify a whole column.
+
+        Values are factorised first, so each distinct (category, notes)
+        pair is classified once and broadcast back to its rows.
+
+        Returns
+        -------
+        canonical, rule_ids : np.ndarray (object), aligned with *categories*
+        """
+        cat_codes, cat_uniques = pd.factorize(categories, use_na_sentinel=True)
+        cat_uniques = np.append(np.asarray(cat_uniques, dtype=object).astype(str), "")
+        cat_codes = np.where(cat_codes < 0, len(cat_uniques) - 1, cat_codes)
+
+        if notes is not None and self.uses_notes:
+            note_codes, note_uniques = pd.factorize(notes, use_na_sentinel=True)
+            note_uniques = np.append(np.asarray(note_uniques, dtype=object).astype(str), "")
+            note_codes = np.where(note_codes < 0, len(note_uniques) - 1, note_codes)
+        else:
+            note_codes = np.zeros(len(cat_codes), dtype=np.int64)
+            note_uniques = np.array([""], dtype=object)
+
+        combined = cat_codes.astype(np.int64) * len(note_uniques) + note_codes
+        keys, inverse = np.unique(combined, return_inverse=True)
+
+        canon = np.empty(len(keys), dtype=object)
+        rule_ids = np.empty(len(keys), dtype=object)
+        for i, key in enumerate(keys):
+            c, n = divmod(int(key), len(note_uniques))
+            canon[i], rule_ids[i] = self.classify_one(cat_uniques[c], note_uniques[n])
+
+        return canon[inverse], rule_ids[inverse]
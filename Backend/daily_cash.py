@@ -0,0 +1,136 @@
+"""
+daily_cash.py – Daily cash balance, low points and intra-month volatility.
+
+Monthly aggregates hide timing: payroll on the 1st and revenue on the
+28th can push cash well below the month-end figure.  Here every
+transaction is binned onto a dense day index (one ``np.bincount``), so
+the cost is linear in rows and the balance series is a single cumsum.
+"""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+DAYS_IN_PROFILE = 31
+
+
+def build_daily_flows(df: pd.DataFrame) -> dict[str, Any]:
+    """
+    Net cash flow per calendar day over the ledger's full date span.
+
+    Returns
+    -------
+    dict with ``start`` (Timestamp of day 0), ``flows`` (np.ndarray of
+    daily net amounts, zero on days without transactions) and
+    ``dom_profile`` (average net flow per day-of-month, index 0 = 1st).
+    """
+    days = df["date"].to_numpy(dtype="datetime64[D]")
+    start = days.min()
+    offsets = (days - start).astype(np.int64)
+    flows = np.bincount(offsets, weights=df["amount"].to_numpy(dtype=float))
+
+    # Day-of-month profile averaged over the months covered
+    dom = pd.DatetimeIndex(days).day.to_numpy() - 1
+    n_months = max(df["month"].nunique(), 1)
+    profile = np.bincount(dom, weights=df["amount"].to_numpy(dtype=float), minlength=DAYS_IN_PROFILE)
+    profile = profile / n_months
+
+    return {"start": pd.Timestamp(start), "flows": flows, "dom_profile": profile}
+
+
+def _project_flows(profile: np.ndarray, first_day: pd.Timestamp, horizon_days: int) -> np.ndarray:
+    """Lay the day-of-month profile over future calendar months."""
+    dates = pd.date_range(first_day, periods=horizon_days, freq="D")
+    dom = dates.day.to_numpy() - 1
+    dim = dates.days_in_month.to_numpy()
+
+    # Profile days beyond a short month's end fall on its last day
+    overflow = np.concatenate([np.cumsum(profile[::-1])[::-1], [0.0]])
+    flows = profile[dom]
+    last_day = dom == dim - 1
+    flows[last_day] += overflow[dim[last_day]]
+    return flows
+
+
+def compute_daily_cash(
+    daily: dict[str, Any],
+    cash_balance: float,
+    horizon_days: int = 90,
+    include_series: bool = True,
+) -> dict[str, Any]:
+    """
+    Daily balance history, minimum-cash day and forward projection.
+
+    *cash_balance* is cash on hand at the end of the ledger; earlier
+    balances are reconstructed backwards from it.
+
+    Returns
+    -------
+    dict with historical and projected low points, per-month intra-month
+    swing (max − min daily balance), and optionally the daily series.
+    """
+    flows = daily["flows"]
+    start = daily["start"]
+    dates = pd.date_range(start, periods=len(flows), freq="D")
+
+    # Balance at end of each day, anchored so the last day == cash_balance
+    balance = cash_balance - flows.sum() + np.cumsum(flows)
+
+    low_idx = int(np.argmin(balance))
+
+    # ── Intra-month volatility ───────────────────────────────────────
+    month_codes, month_labels = pd.factorize(dates.to_period("M"))
+    hi = np.full(len(month_labels), -np.inf)
+    lo = np.full(len(month_labels), np.inf)
+    np.maximum.at(hi, month_codes, balance)
+    np.minimum.at(lo, month_codes, balance)
+    swing = hi - lo
+
+    # Day-of-month of each month's low point
+    order = np.lexsort((balance, month_codes))
+    first_of_group = np.r_[True, month_codes[order][1:] != month_codes[order][:-1]]
+    low_dom = dates.day.to_numpy()[order[first_of_group]]
+
+    # ── Projection ───────────────────────────────────────────────────
+    proj_flows = _project_flows(daily["dom_profile"], dates[-1] + pd.Timedelta(days=1), horizon_days)
+    proj_balance = cash_balance + np.cumsum(proj_flows)
+    proj_dates = pd.date_range(dates[-1] + pd.Timedelta(days=1), periods=horizon_days, freq="D")
+    proj_low = int(np.argmin(proj_balance)) if horizon_days else None
+    negative = np.flatnonzero(proj_balance < 0)
+
+    result: dict[str, Any] = {
+        "cash": cash_balance,
+        "days_covered": len(flows),
+        "min_cash": round(float(balance[low_idx]), 2),
+        "min_cash_date": dates[low_idx].strftime("%Y-%m-%d"),
+        "avg_intra_month_swing": round(float(swing.mean()), 2),
+        "max_intra_month_swing": round(float(swing.max()), 2),
+        "typical_low_day_of_month": int(np.bincount(low_dom).argmax()),
+        "months": [
+            {
+                "month": str(label),
+                "min_balance": round(float(lo[i]), 2),
+                "max_balance": round(float(hi[i]), 2),
+                "swing": round(float(swing[i]), 2),
+                "low_day": int(low_dom[i]),
+            }
+            for i, label in enumerate(month_labels)
+        ],
+        "projection": {
+            "days": horizon_days,
+            "min_cash": round(float(proj_balance[proj_low]), 2) if proj_low is not None else None,
+            "min_cash_date": proj_dates[proj_low].strftime("%Y-%m-%d") if proj_low is not None else None,
+            "first_negative_date": proj_dates[negative[0]].strftime("%Y-%m-%d") if len(negative) else None,
+        },
+    }
+
+    if include_series:
+        result["history"] = {
+            "dates": dates.strftime("%Y-%m-%d").tolist(),
+            "balance": np.round(balance, 2).tolist(),
+        }
+        result["projection"]["dates"] = proj_dates.strftime("%Y-%m-%d").tolist()
+        result["projection"]["balance"] = np.round(proj_balance, 2).tolist()
+
+    return result
@@ -0,0 +1,205 @@
+"""
+data_quality.py – Upload-time data-quality checks.
+
+Every check is a vectorised boolean mask over the whole ledger, so one
+pass collects *all* problems instead of stopping at the first.  Each
+issue keeps its full count but at most ``max_rows`` example row numbers,
+which bounds the report's size however dirty the file is.
+
+Severity decides what happens next: ``error`` rows (unparseable date or
+amount) cannot be used and either abort the upload or are dropped;
+``warning`` rows are kept and only reported.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+MAX_ISSUE_ROWS = 20
+
+# A category's minority sign is suspicious only when it is rare
+SIGN_MINORITY_SHARE = 0.2
+SIGN_MIN_ROWS = 3
+
+# Robust z (median / MAD) beyond which an amount is an outlier
+OUTLIER_Z = 6.0
+OUTLIER_MIN_ROWS = 5
+_MAD_SCALE = 1.4826
+
+
+class DataQualityError(ValueError):
+    """Upload rejected for unusable rows; carries the full ``report``."""
+
+    def __init__(self, message: str, report: dict[str, Any]):
+        super().__init__(message)
+        self.report = report
+
+
+def _issue(
+    check: str,
+    severity: str,
+    mask: np.ndarray,
+    message: str,
+    max_rows: int,
+) -> Optional[dict[str, Any]]:
+    """Issue entry for *mask*, or None when no row is flagged."""
+    count = int(mask.sum())
+    if not count:
+        return None
+    rows = np.flatnonzero(mask)[:max_rows] + 1  # 1-based data rows
+    return {
+        "check": check,
+        "severity": severity,
+        "count": count,
+        "rows": rows.tolist(),
+        "message": message.format(count=count),
+    }
+
+
+def _text_codes(values: pd.Series) -> np.ndarray:
+    """
+    Codes for the stripped, lower-cased text of *values* (-1 when blank).
+
+    String work is done once per distinct value, not once per row.
+    """
+    codes, uniques = pd.factorize(values)
+    keys = pd.Index(uniques.astype(str)).str.strip().str.lower()
+    key_codes, _ = pd.factorize(keys)
+    # Trailing -1 slot: NaN cells (code -1) map to blank, and the
+    # lookup stays indexable when every value is NaN.
+    lookup = np.append(np.where(keys == "", -1, key_codes), -1)
+    return lookup[codes]
+
+
+def _blank(values: pd.Series, candidates: np.ndarray) -> np.ndarray:
+    """Blank cells among the *candidates* rows (others are never blank)."""
+    blank = np.zeros(len(values), dtype=bool)
+    if candidates.any():
+        blank[candidates] = _text_codes(values[candidates]) < 0
+    return blank
+
+
+def _sign_anomalies(category: pd.Series, amount: pd.Series) -> np.ndarray:
+    """Rows whose sign disagrees with a strong majority in their category."""
+    sign = np.sign(amount.to_numpy())
+    frame = pd.DataFrame({"cat": category.to_numpy(), "pos": sign > 0, "neg": sign < 0})
+    grouped = frame.groupby("cat", sort=False)
+    pos = grouped["pos"].transform("sum").to_numpy()
+    neg = grouped["neg"].transform("sum").to_numpy()
+    n = pos + neg
+    minority = np.where(pos >= neg, sign < 0, sign > 0)
+    share = np.minimum(pos, neg) / np.maximum(n, 1)
+    return minority & (n >= SIGN_MIN_ROWS) & (share <= SIGN_MINORITY_SHARE)
+
+
+def _outliers(category: pd.Series, amount: pd.Series) -> np.ndarray:
+    """Rows far from their category's median magnitude (robust z-score)."""
+    frame = pd.DataFrame({"cat": category.to_numpy(), "x": amount.abs().to_numpy()})
+    grouped = frame.groupby("cat", sort=False)["x"]
+    median = grouped.transform("median").to_numpy()
+    dev = np.abs(frame["x"].to_numpy() - median)
+    mad = pd.Series(dev).groupby(frame["cat"].to_numpy(), sort=False).transform("median").to_numpy()
+    size = grouped.transform("size").to_numpy()
+    z = np.divide(dev, _MAD_SCALE * mad, out=np.zeros_like(dev), where=mad > 0)
+    return (z > OUTLIER_Z) & (size >= OUTLIER_MIN_ROWS)
+
+
+def check_quality(
+    df: pd.DataFrame,
+    max_rows: int = MAX_ISSUE_ROWS,
+    today: Optional[pd.Timestamp] = None,
+) -> tuple[pd.DataFrame, np.ndarray, dict[str, Any]]:
+    """
+    Parse ``date``/``amount`` leniently and run every check at once.
+
+    Parameters
+    ----------
+    df : pd.DataFrame   Raw upload with lower-cased headers.
+    max_rows : int      Example row numbers kept per issue.
+    today : Timestamp   Reference for future-dated rows (default: now).
+
+    Returns
+    -------
+    df : pd.DataFrame   Copy with ``date`` as naive UTC datetime (NaT when bad) and
+                        ``amount`` as float (NaN when bad).
+    invalid : np.ndarray  Bool mask of error rows.
+    report : dict       ``rows_checked``, ``errors``, ``warnings`` and the
+                        ``issues`` list (check, severity, count, rows,
+                        message); row numbers are 1-based data rows.
+    """
+    today = (today or pd.Timestamp.now()).normalize()
+    raw = df
+    df = df.copy()
+    issues: list[Optional[dict[str, Any]]] = []
+
+    # ── Errors: unusable rows ────────────────────────────────────────
+    # Offsets (e.g. "...Z", "+02:00") are normalised to naive UTC so
+    # tz-aware and naive dates compare and bucket into months alike
+    df["date"] = pd.to_datetime(df["date"], errors="coerce", utc=True).dt.tz_convert(None)
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
+    bad_date = df["date"].isna().to_numpy()
+    bad_amount = df["amount"].isna().to_numpy()
+    missing_date = _blank(raw["date"], bad_date)
+    missing_amount = _blank(raw["amount"], bad_amount)
+
+    issues += [
+        _issue("missing_date", "error", missing_date, "Column 'date' is empty in {count} rows.", max_rows),
+        _issue("bad_date", "error", bad_date & ~missing_date,
+               "Column 'date' contains {count} unparseable values.", max_rows),
+        _issue("missing_amount", "error", missing_amount, "Column 'amount' is empty in {count} rows.", max_rows),
+        _issue("bad_amount", "error", bad_amount & ~missing_amount,
+               "Column 'amount' contains {count} non-numeric values.", max_rows),
+    ]
+    invalid = bad_date | bad_amount
+    valid = ~invalid
+
+    # ── Warnings: usable but suspicious rows ─────────────────────────
+    issues.append(_issue(
+        "duplicate", "warning", raw.duplicated(keep="first").to_numpy(),
+        "{count} rows exactly duplicate an earlier row.", max_rows,
+    ))
+    issues.append(_issue(
+        "future_date", "warning", (df["date"] > today).to_numpy(),
+        f"{{count}} rows are dated after {today:%Y-%m-%d}.", max_rows,
+    ))
+
+    category = pd.Series(_text_codes(raw["category"]))
+    usable = valid & (category.to_numpy() >= 0)
+    if usable.any():
+        sign = np.zeros(len(df), dtype=bool)
+        sign[usable] = _sign_anomalies(category[usable], df["amount"][usable])
+        issues.append(_issue(
+            "sign_anomaly", "warning", sign,
+            "{count} rows have the opposite sign to the rest of their category.", max_rows,
+        ))
+        outlier = np.zeros(len(df), dtype=bool)
+        outlier[usable] = _outliers(category[usable], df["amount"][usable])
+        issues.append(_issue(
+            "outlier", "warning", outlier,
+            "{count} amounts are extreme for their category.", max_rows,
+        ))
+
+    # ── Gaps: months with no transactions inside the covered range ───
+    dates = df.loc[valid, "date"]
+    if len(dates):
+        codes = np.unique((dates.dt.year * 12 + dates.dt.month - 1).to_numpy())
+        missing = np.setdiff1d(np.arange(codes[0], codes[-1] + 1), codes, assume_unique=True)
+        if len(missing):
+            issues.append({
+                "check": "month_gap",
+                "severity": "warning",
+                "count": int(len(missing)),
+                "months": [f"{m // 12:04d}-{m % 12 + 1:02d}" for m in missing[:max_rows].tolist()],
+                "message": f"{len(missing)} months between the first and last date have no transactions.",
+            })
+
+    found = [i for i in issues if i is not None]
+    report = {
+        "rows_checked": len(df),
+        "errors": sum(i["count"] for i in found if i["severity"] == "error"),
+        "invalid_rows": int(invalid.sum()),
+        "warnings": sum(i["count"] for i in found if i["severity"] == "warning"),
+        "issues": found,
+    }
+    return df, invalid, report
@@ -0,0 +1,206 @@
+"""
+encoding.py – Response serialisation, content negotiation and compression.
+
+JSON is rendered with orjson when it is installed.  Array-heavy endpoints
+can also be requested as MessagePack (``Accept: application/x-msgpack``)
+or Arrow IPC stream (``Accept: application/vnd.apache.arrow.stream``);
+both are optional and fall back to JSON when the library is missing.
+
+Compression prefers zstd, then brotli, then gzip, depending on what the
+client accepts and which codecs are importable.
+"""
+
+import gzip
+import importlib.util
+import json
+from typing import Any, Callable, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+try:
+    import orjson  # noqa: F401
+    FastJSONResponse: type[JSONResponse] = ORJSONResponse
+except ImportError:  # orjson is optional
+    FastJSONResponse = JSONResponse
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional
+    msgpack = None
+
+# pyarrow is optional and slow to import; loaded on the first Arrow request
+HAS_ARROW = importlib.util.find_spec("pyarrow") is not None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional
+    zstandard = None
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+# ── Columnar helpers ─────────────────────────────────────────────────
+def records_to_columns(records: list[dict]) -> dict[str, list]:
+    """Transpose a list of row dicts into ``{column: [values]}``."""
+    keys = dict.fromkeys(k for row in records for k in row)
+    return {k: [row.get(k) for row in records] for k in keys}
+
+
+def _arrow_bytes(columns: dict[str, list], payload: dict[str, Any]) -> bytes:
+    import pyarrow as pa
+
+    scalars = {k: v for k, v in payload.items() if not isinstance(v, (list, dict))}
+    table = pa.table(columns)
+    table = table.replace_schema_metadata({"payload": json.dumps(scalars, default=str)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# ── Negotiation ──────────────────────────────────────────────────────
+def encode_response(
+    request: Request,
+    payload: dict[str, Any],
+    table: Optional[Callable[[dict[str, Any]], dict[str, list]]] = None,
+) -> Response:
+    """
+    Render *payload* in the best format the client accepts.
+
+    Parameters
+    ----------
+    request : Request
+        Incoming request; only the ``Accept`` header is inspected.
+    payload : dict
+        Response body.  Returned directly (no ``jsonable_encoder`` pass),
+        so it must already contain plain Python types.
+    table : callable, optional
+        Builds the column mapping sent as Arrow IPC.  Endpoints without
+        one never answer in Arrow.  Scalar fields travel in the schema
+        metadata under ``payload``.
+    """
+    accept = request.headers.get("accept", "")
+    # The body depends on Accept, so shared caches must key on it
+    headers = {"Vary": "Accept"}
+
+    if table is not None and HAS_ARROW and ARROW_MEDIA_TYPE in accept:
+        columns = table(payload)
+        return Response(_arrow_bytes(columns, payload), media_type=ARROW_MEDIA_TYPE, headers=headers)
+
+    if msgpack is not None and MSGPACK_MEDIA_TYPE in accept:
+        return Response(msgpack.packb(payload), media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+
+    return FastJSONResponse(payload, headers=headers)
+
+
+# ── Compression middleware ───────────────────────────────────────────
+def _parse_accept_encoding(header: str) -> set[str]:
+    accepted: set[str] = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def _pick_codec(accepted: set[str]) -> Optional[str]:
+    if zstandard is not None and "zstd" in accepted:
+        return "zstd"
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _add_vary(raw_headers: list[tuple[bytes, bytes]], field: bytes) -> list[tuple[bytes, bytes]]:
+    """*raw_headers* with *field* merged into a single ``Vary`` header."""
+    values = [v for k, v in raw_headers if k.lower() == b"vary"]
+    fields = [f.strip() for v in values for f in v.split(b",") if f.strip()]
+    if field.lower() not in (f.lower() for f in fields):
+        fields.append(field)
+    return [(k, v) for k, v in raw_headers if k.lower() != b"vary"] + [(b"vary", b", ".join(fields))]
+
+
+def _compress(codec: str, body: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    if codec == "br":
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses responses of at least *minimum_size*
+    bytes with the best codec the client advertises.
+
+    Bodies are buffered in full; every endpoint here returns a single
+    in-memory payload, so nothing is streamed.  Every response carries
+    ``Vary: Accept-Encoding``, compressed or not, so a shared cache never
+    serves one client's encoding to another.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        codec = _pick_codec(_parse_accept_encoding(headers.get("accept-encoding", "")))
+        if codec is None:
+            async def vary_send(message):
+                if message["type"] == "http.response.start":
+                    headers = _add_vary(list(message.get("headers", [])), b"Accept-Encoding")
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, vary_send)
+            return
+
+        start_message: dict = {}
+        chunks: list[bytes] = []
+
+        async def buffered_send(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            raw_headers = [
+                (k, v) for k, v in start_message.get("headers", [])
+                if k.lower() != b"content-length"
+            ]
+            already_encoded = any(k.lower() == b"content-encoding" for k, _ in raw_headers)
+
+            if len(body) >= self.minimum_size and not already_encoded:
+                body = _compress(codec, body)
+                raw_headers.append((b"content-encoding", codec.encode()))
+
+            raw_headers = _add_vary(raw_headers, b"Accept-Encoding")
+            raw_headers.append((b"content-length", str(len(body)).encode()))
+            await send({**start_message, "headers": raw_headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, buffered_send)
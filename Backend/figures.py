@@ -0,0 +1,18 @@
+"""
+figures.py – Runway arithmetic and currency formatting.
+
+Dependency-free so the rule-based narrative can share them with the
+pandas-backed engines without pulling pandas in at startup.
+"""
+
+from typing import Optional
+
+
+def months_of_runway(cash: float, burn: float) -> Optional[float]:
+    """Months of runway at *burn* per month, or None when burn <= 0 (infinite)."""
+    return round(cash / burn, 2) if burn > 0 else None
+
+
+def fmt_currency(val: float) -> str:
+    """Format a number as $X,XXX."""
+    return f"${val:,.0f}"
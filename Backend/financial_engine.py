@@ -6,6 +6,8 @@ from typing import Any
 
 import pandas as pd
 
+from figures import months_of_runway
+
 
 def compute_metrics(df: pd.DataFrame, cash_balance: float) -> dict[str, Any]:
     """
@@ -37,10 +39,7 @@ def compute_metrics(df: pd.DataFrame, cash_balance: float) -> dict[str, Any]:
     monthly_burn: float = float(monthly["net_burn"].mean())
 
     # ── Runway ────────────────────────────────────────────────────────
-    if monthly_burn <= 0:
-        runway_months = None  # infinite / uncapped
-    else:
-        runway_months = round(cash_balance / monthly_burn, 2)
+    runway_months = months_of_runway(cash_balance, monthly_burn)
 
     # ── Expense breakdown ─────────────────────────────────────────────
     expenses_df = df[df["amount"] < 0].copy()
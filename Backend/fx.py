@@ -0,0 +1,116 @@
+"""
+fx.py – FX rate tables and currency normalisation for uploaded ledgers.
+
+A rate table is a CSV with columns ``date, currency, rate`` where *rate*
+is the number of base-currency units per one unit of *currency* in effect
+from *date* onwards.  Monthly tables (``2025-07``) work as well as daily.
+"""
+
+import hashlib
+from io import StringIO
+from typing import Optional
+
+import pandas as pd
+
+BASE_CURRENCY = "USD"
+
+FX_REQUIRED_COLUMNS = {"date", "currency", "rate"}
+
+# Parsed rate tables keyed by content hash, reused across uploads
+_RATE_TABLE_CACHE: dict[str, pd.DataFrame] = {}
+
+
+def parse_fx_table(raw_bytes: bytes) -> pd.DataFrame:
+    """
+    Parse FX rate CSV bytes into a table sorted by date.
+
+    Returns
+    -------
+    pd.DataFrame with columns: date, currency, rate
+
+    Raises
+    ------
+    ValueError  with a human-readable message on bad input.
+    """
+    key = hashlib.sha256(raw_bytes).hexdigest()
+    if key in _RATE_TABLE_CACHE:
+        return _RATE_TABLE_CACHE[key]
+
+    try:
+        rates = pd.read_csv(StringIO(raw_bytes.decode("utf-8")))
+    except UnicodeDecodeError:
+        raise ValueError("File is not valid UTF-8 text.")
+    except Exception as exc:
+        raise ValueError(f"Could not parse CSV: {exc}")
+
+    rates.columns = [c.strip().lower() for c in rates.columns]
+    missing = FX_REQUIRED_COLUMNS - set(rates.columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
+
+    try:
+        rates["date"] = pd.to_datetime(rates["date"], format="mixed")
+    except Exception:
+        raise ValueError("Column 'date' contains unparseable values.")
+
+    rates["rate"] = pd.to_numeric(rates["rate"], errors="coerce")
+    if rates["rate"].isna().any() or (rates["rate"] <= 0).any():
+        raise ValueError("Column 'rate' must contain positive numbers.")
+
+    rates["currency"] = rates["currency"].astype(str).str.strip().str.upper()
+    rates = rates[["date", "currency", "rate"]].sort_values("date", kind="stable")
+    rates = rates.reset_index(drop=True)
+
+    _RATE_TABLE_CACHE[key] = rates
+    return rates
+
+
+def convert_to_base(
+    df: pd.DataFrame,
+    rates: Optional[pd.DataFrame],
+    base_currency: str = BASE_CURRENCY,
+) -> pd.DataFrame:
+    """
+    Convert ``df["amount"]`` into *base_currency* in place.
+
+    Each row takes the latest rate on or before its date for its
+    currency (rows dated before a currency's first rate use that first
+    rate).  The original values are kept in ``amount_original``.
+
+    Raises
+    ------
+    ValueError  if a currency other than the base has no rates.
+    """
+    base_currency = base_currency.upper()
+    currency = df["currency"].fillna("").astype(str).str.strip().str.upper()
+    currency = currency.mask(currency == "", base_currency)
+    df["currency"] = currency
+
+    foreign = currency != base_currency
+    if not foreign.any():
+        return df
+
+    needed = set(currency[foreign].unique())
+    available = set(rates["currency"].unique()) if rates is not None else set()
+    missing = needed - available
+    if missing:
+        raise ValueError(
+            f"No FX rates for currencies: {', '.join(sorted(missing))}. "
+            "Upload a rate table via POST /fx-rates first."
+        )
+
+    left = (
+        pd.DataFrame({"date": df["date"].to_numpy(), "currency": currency.to_numpy()})[foreign.to_numpy()]
+        .reset_index()
+        .sort_values("date", kind="stable")
+    )
+    back = pd.merge_asof(left, rates, on="date", by="currency", direction="backward")
+    fwd = pd.merge_asof(left, rates, on="date", by="currency", direction="forward")
+    row_rate = back["rate"].fillna(fwd["rate"]).to_numpy()
+
+    multiplier = pd.Series(1.0, index=range(len(df)))
+    multiplier.iloc[back["index"].to_numpy()] = row_rate
+
+    df["amount_original"] = df["amount"]
+    df["amount"] = df["amount"].to_numpy(dtype=float) * multiplier.to_numpy()
+    return df
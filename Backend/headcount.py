@@ -0,0 +1,159 @@
+"""
+headcount.py – Hiring plans as month-by-month payroll cost.
+
+A plan is a list of roles, each with a head count, start (and optional
+end) month, monthly salary and burden rate (employer taxes, benefits,
+equipment as a share of salary).  Month 0 is the first month after the
+ledger ends, matching ``baseline.forecast_cash``.
+
+All roles are laid onto the horizon at once with a difference array:
+each role adds its loaded cost at its start month and removes it at its
+end month, and one cumulative sum yields the dense payroll path.  Cost
+is O(roles + months), so plans with hundreds of roles over several
+years build in a couple of milliseconds and can be cached and reused
+by scenario, optimizer and forecast calls.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+
+from figures import months_of_runway
+
+DEFAULT_HORIZON = 36
+DEFAULT_BURDEN_RATE = 0.2
+UNASSIGNED_DEPARTMENT = "Unassigned"
+
+
+def _layer(index: tuple[np.ndarray, ...], start: np.ndarray, end: np.ndarray,
+           values: np.ndarray, shape: tuple[int, ...]) -> np.ndarray:
+    """Sum *values* over [start, end) per row of *index* via one cumsum."""
+    diff = np.zeros(shape[:-1] + (shape[-1] + 1,))
+    np.add.at(diff, index + (start,), values)
+    np.add.at(diff, index + (end,), -values)
+    return np.cumsum(diff, axis=-1)[..., :-1]
+
+
+def build_headcount_plan(roles: list[dict[str, Any]], horizon: int = DEFAULT_HORIZON) -> dict[str, Any]:
+    """
+    Lay a hiring plan over *horizon* months.
+
+    Parameters
+    ----------
+    roles : list of dict
+        ``title``, ``start_month`` and ``monthly_salary``; optional
+        ``count`` (1), ``end_month`` (exclusive, default: never),
+        ``burden_rate`` (DEFAULT_BURDEN_RATE) and ``department``.
+    horizon : int   Months to cover.
+
+    Returns
+    -------
+    dict with ``horizon``, dense ``payroll`` and ``headcount`` arrays
+    (one value per month), ``departments`` and a matching
+    ``department_payroll`` matrix (departments × months), per-role
+    ``roles`` rows and ``avg_monthly_payroll`` over the horizon.
+
+    Raises
+    ------
+    ValueError  on a role whose ``end_month`` is not after its start.
+    """
+    start = np.array([r["start_month"] for r in roles], dtype=np.int64)
+    open_ended = np.array([r.get("end_month") is None for r in roles], dtype=bool)
+    end = np.array([0 if r.get("end_month") is None else r["end_month"] for r in roles], dtype=np.int64)
+    bad = np.flatnonzero(~open_ended & (end <= start))
+    if len(bad):
+        raise ValueError(f"Role '{roles[int(bad[0])]['title']}' ends before it starts.")
+    # Open-ended roles starting past the horizon contribute nothing to it
+    end = np.where(open_ended, np.maximum(start, horizon), end)
+
+    count = np.array([r.get("count", 1) for r in roles], dtype=float)
+    salary = np.array([r["monthly_salary"] for r in roles], dtype=float)
+    burden = np.array(
+        [DEFAULT_BURDEN_RATE if r.get("burden_rate") is None else r["burden_rate"] for r in roles], dtype=float
+    )
+    loaded = count * salary * (1 + burden)
+
+    # Months outside the horizon collapse onto its edges
+    start_c = np.clip(start, 0, horizon)
+    end_c = np.clip(end, 0, horizon)
+
+    departments, dept_codes = np.unique(
+        np.array([r.get("department") or UNASSIGNED_DEPARTMENT for r in roles], dtype=object),
+        return_inverse=True,
+    )
+
+    payroll = _layer((), start_c, end_c, loaded, (horizon,))
+    headcount = _layer((), start_c, end_c, count, (horizon,))
+    dept_payroll = _layer((dept_codes,), start_c, end_c, loaded, (len(departments), horizon))
+
+    active_months = end_c - start_c
+    return {
+        "horizon": horizon,
+        "payroll": payroll,
+        "headcount": headcount,
+        "departments": [str(d) for d in departments],
+        "department_payroll": dept_payroll,
+        "avg_monthly_payroll": float(payroll.mean()) if horizon else 0.0,
+        "roles": [
+            {
+                "title": r["title"],
+                "department": r.get("department") or UNASSIGNED_DEPARTMENT,
+                "count": int(count[i]),
+                "start_month": int(start[i]),
+                "end_month": None if open_ended[i] else int(end[i]),
+                "monthly_cost": round(float(loaded[i]), 2),
+                "active_months": int(active_months[i]),
+                # Share of avg_monthly_payroll this role accounts for
+                "avg_monthly_cost": round(float(loaded[i] * active_months[i] / horizon), 2) if horizon else 0.0,
+            }
+            for i, r in enumerate(roles)
+        ],
+    }
+
+
+def payroll_path(plan: Optional[dict[str, Any]], months: int) -> np.ndarray:
+    """
+    Planned payroll for the next *months* months; beyond the plan's
+    horizon the last month's run-rate is held.
+    """
+    if plan is None or not plan["horizon"]:
+        return np.zeros(months)
+    payroll = plan["payroll"]
+    if months <= len(payroll):
+        return payroll[:months]
+    return np.concatenate([payroll, np.full(months - len(payroll), payroll[-1])])
+
+
+def with_planned_payroll(metrics: dict[str, Any], plan: Optional[dict[str, Any]]) -> dict[str, Any]:
+    """
+    ``compute_metrics`` output with *plan*'s average monthly payroll
+    added to burn (and runway recomputed), as ``optimizer.optimize``
+    counts it; *metrics* unchanged when there is no plan.
+    """
+    if plan is None:
+        return metrics
+    burn = metrics["burn"] + plan["avg_monthly_payroll"]
+    return {
+        **metrics,
+        "burn": round(burn, 2),
+        "runway": months_of_runway(metrics["cash"], burn),
+        "planned_payroll": round(plan["avg_monthly_payroll"], 2),
+    }
+
+
+def plan_summary(plan: dict[str, Any]) -> dict[str, Any]:
+    """JSON-ready view of a plan built by ``build_headcount_plan``."""
+    payroll = plan["payroll"]
+    return {
+        "horizon": plan["horizon"],
+        "roles": plan["roles"],
+        "total_hires": int(sum(r["count"] for r in plan["roles"])),
+        "payroll": np.round(payroll, 2).tolist(),
+        "headcount": plan["headcount"].astype(int).tolist(),
+        "peak_payroll": round(float(payroll.max()), 2) if len(payroll) else 0.0,
+        "avg_monthly_payroll": round(plan["avg_monthly_payroll"], 2),
+        "by_department": {
+            dept: np.round(plan["department_payroll"][i], 2).tolist()
+            for i, dept in enumerate(plan["departments"])
+        },
+    }
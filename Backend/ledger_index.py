@@ -0,0 +1,241 @@
+"""
+ledger_index.py – Per-dataset indexes for fast filtered transaction lookups.
+
+Built once at upload.  Rows are stored sorted by date, and a secondary
+permutation groups them by category (date-ordered within each group), so
+every category maps to one contiguous range.  Date and category filters
+are then binary searches instead of full scans.
+
+Every sort order is a precomputed permutation, so ordering a page is a
+mask over it rather than a sort.  Cursors are keyset cursors: they carry
+the last row's rank in the sort order plus a hash of the query, so a
+cursor cannot be replayed against different filters.
+"""
+
+import base64
+import hashlib
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+SORT_FIELDS = ("date", "amount", "category")
+
+
+class LedgerIndex:
+    """Immutable, query-ready view over one uploaded ledger."""
+
+    def __init__(self, df: pd.DataFrame, version: int):
+        self.version = version
+
+        order = np.argsort(df["date"].to_numpy(dtype="datetime64[ns]"), kind="stable")
+        self._rows = df.index.to_numpy()[order]
+        self._dates = df["date"].to_numpy(dtype="datetime64[ns]")[order]
+        self._amounts = df["amount"].to_numpy(dtype=float)[order]
+
+        cats = pd.Categorical(df["category"].to_numpy()[order])
+        self._cat_codes = cats.codes
+        self._categories = np.asarray(cats.categories, dtype=object)
+        self._cat_lookup = {str(c).lower(): i for i, c in enumerate(self._categories)}
+
+        # Notes repeat heavily (one per vendor/memo), so they are stored
+        # as codes into their distinct values and searched on those; the
+        # last distinct value stands for missing notes
+        if "notes" in df.columns:
+            notes = df["notes"].to_numpy(dtype=object)[order]
+            note_codes, note_uniques = pd.factorize(notes, use_na_sentinel=True)
+            note_uniques = np.asarray(note_uniques, dtype=object)
+        else:
+            note_codes, note_uniques = np.full(len(order), -1), np.empty(0, dtype=object)
+        self._note_codes = np.where(note_codes < 0, len(note_uniques), note_codes)
+        self._notes = np.append(note_uniques, None)
+        self._notes_lower = np.append(
+            pd.Series(note_uniques, dtype=object).astype(str).str.lower().to_numpy(), ""
+        )
+
+        # Category → contiguous range of the category permutation
+        self._cat_perm = np.argsort(self._cat_codes, kind="stable")
+        self._cat_dates = self._dates[self._cat_perm]
+        counts = np.bincount(self._cat_codes, minlength=len(self._categories))
+        ends = np.cumsum(counts)
+        self._cat_ranges = np.stack([ends - counts, ends], axis=1)
+
+        # Sort order → positions in that order, and each position's rank
+        # in it (ties keep date order)
+        n = len(order)
+        self._orders = {
+            "date": np.arange(n),
+            "amount": np.argsort(self._amounts, kind="stable"),
+            "category": self._cat_perm,
+        }
+        self._ranks = {}
+        for field, perm in self._orders.items():
+            rank = np.empty(n, dtype=np.int64)
+            rank[perm] = np.arange(n)
+            self._ranks[field] = rank
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # ── Cursors ──────────────────────────────────────────────────────
+    @staticmethod
+    def query_key(**filters: Any) -> str:
+        """Short hash of the filters and ordering a cursor is bound to."""
+        return hashlib.blake2b(repr(sorted(filters.items())).encode(), digest_size=8).hexdigest()
+
+    def encode_cursor(self, key: str, last_rank: int) -> str:
+        return base64.urlsafe_b64encode(f"{self.version}:{key}:{last_rank}".encode()).decode()
+
+    def decode_cursor(self, cursor: str, key: str) -> int:
+        """
+        Return the last rank in *cursor*; ValueError if malformed, stale
+        or issued for a different query.
+        """
+        try:
+            version, cursor_key, last_rank = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+            version, last_rank = int(version), int(last_rank)
+        except Exception:
+            raise ValueError("Invalid cursor.")
+        if version != self.version:
+            raise ValueError("Cursor belongs to a previous upload; restart pagination.")
+        if cursor_key != key:
+            raise ValueError("Cursor belongs to a different query; restart pagination.")
+        if last_rank < 0:
+            raise ValueError("Invalid cursor.")
+        return last_rank
+
+    # ── Query ────────────────────────────────────────────────────────
+    @staticmethod
+    def _date_bounds(
+        dates: np.ndarray,
+        start: Optional[np.datetime64],
+        end: Optional[np.datetime64],
+    ) -> tuple[int, int]:
+        lo = int(np.searchsorted(dates, start, side="left")) if start is not None else 0
+        hi = int(np.searchsorted(dates, end, side="left")) if end is not None else len(dates)
+        return lo, max(lo, hi)
+
+    def _candidates(
+        self,
+        start: Optional[np.datetime64],
+        end: Optional[np.datetime64],
+        categories: Optional[list[str]],
+    ) -> np.ndarray:
+        """Date-ordered positions matching the date range and categories."""
+        if not categories:
+            lo, hi = self._date_bounds(self._dates, start, end)
+            return np.arange(lo, hi)
+
+        parts: list[np.ndarray] = []
+        for name in categories:
+            code = self._cat_lookup.get(name.strip().lower())
+            if code is None:
+                continue
+            r_lo, r_hi = self._cat_ranges[code]
+            lo, hi = self._date_bounds(self._cat_dates[r_lo:r_hi], start, end)
+            parts.append(self._cat_perm[r_lo + lo:r_lo + hi])
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts))
+
+    def query(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        categories: Optional[list[str]] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        search: Optional[str] = None,
+        sort_by: str = "date",
+        descending: bool = False,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Return one page of transactions matching every supplied filter.
+
+        Dates are inclusive.  ``search`` is a case-insensitive substring
+        match on notes.  Raises ValueError on bad input.
+        """
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"sort_by must be one of: {', '.join(SORT_FIELDS)}")
+
+        try:
+            start = np.datetime64(pd.Timestamp(start_date), "ns") if start_date else None
+            end = np.datetime64(pd.Timestamp(end_date) + pd.Timedelta(days=1), "ns") if end_date else None
+        except Exception:
+            raise ValueError("Dates must be in YYYY-MM-DD format.")
+
+        key = self.query_key(
+            start=start_date or None,
+            end=end_date or None,
+            categories=sorted({c.strip().lower() for c in categories}) if categories else None,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            search=search.lower() if search else None,
+            sort_by=sort_by,
+            descending=descending,
+        )
+        after = self.decode_cursor(cursor, key) if cursor else None
+
+        pos = self._candidates(start, end, categories)
+
+        # ── Residual filters on the (already narrowed) candidates ────
+        if min_amount is not None or max_amount is not None:
+            amt = self._amounts[pos]
+            mask = np.ones(len(pos), dtype=bool)
+            if min_amount is not None:
+                mask &= amt >= min_amount
+            if max_amount is not None:
+                mask &= amt <= max_amount
+            pos = pos[mask]
+
+        if search:
+            hits = pd.Series(self._notes_lower).str.contains(search.lower(), regex=False).to_numpy()
+            pos = pos[hits[self._note_codes[pos]]]
+
+        # ── Ordering: filter the precomputed permutation ────────────
+        if sort_by != "date":
+            perm = self._orders[sort_by]
+            if len(pos) < len(self):
+                keep = np.zeros(len(self), dtype=bool)
+                keep[pos] = True
+                perm = perm[keep[perm]]
+            pos = perm
+        ranks = self._ranks[sort_by][pos]  # ascending
+
+        # ── Page: rows strictly after the cursor's rank ──────────────
+        if descending:
+            hi = int(np.searchsorted(ranks, after, side="left")) if after is not None else len(pos)
+            lo = max(hi - limit, 0)
+            page, remaining = pos[lo:hi][::-1], lo
+        else:
+            lo = int(np.searchsorted(ranks, after, side="right")) if after is not None else 0
+            hi = min(lo + limit, len(pos))
+            page, remaining = pos[lo:hi], len(pos) - hi
+        next_cursor = self.encode_cursor(key, int(self._ranks[sort_by][page[-1]])) if remaining else None
+
+        dates = pd.DatetimeIndex(self._dates[page]).strftime("%Y-%m-%d")
+        transactions = [
+            {
+                "row": int(row),
+                "date": d,
+                "amount": float(amt),
+                "category": str(self._categories[code]),
+                "notes": None if pd.isna(note) else str(note),
+            }
+            for row, d, amt, code, note in zip(
+                self._rows[page],
+                dates,
+                self._amounts[page],
+                self._cat_codes[page],
+                self._notes[self._note_codes[page]],
+            )
+        ]
+
+        return {
+            "total": int(len(pos)),
+            "count": len(transactions),
+            "next_cursor": next_cursor,
+            "transactions": transactions,
+        }
@@ -2,22 +2,69 @@
 main.py – FastAPI app + endpoints.  Logic lives in other modules.
 """
 
-from typing import Optional
+import itertools
+import os
+import threading
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-import pandas as pd
-from fastapi import FastAPI, File, HTTPException, Query, UploadFile
+import startup
+from startup import deferred
+
+from fastapi import FastAPI, File, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from pydantic import BaseModel, Field
 
-from financial_engine import compute_metrics
-from optimizer import optimize
-from utils import parse_and_validate_csv
-from ai_layer import generate_insights, generate_board_report, ask_cfo_question, generate_ai_optimization
-from anomaly_detector import detect_anomalies
+from narrative import answer_question, render_board_report, render_insights
+from encoding import CompressionMiddleware, FastJSONResponse, encode_response, records_to_columns
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from classifier import CategoryClassifier
+    from ledger_index import LedgerIndex
+
+startup.load_env()
+
+# Analytics entry points: pandas/numpy and friends load on first call
+# (or earlier, from the background warm-up; see startup.py)
+compute_metrics = deferred("financial_engine", "compute_metrics")
+optimize = deferred("optimizer", "optimize")
+parse_and_validate_csv = deferred("utils", "parse_and_validate_csv")
+build_classifier = deferred("classifier", "CategoryClassifier")
+parse_fx_table = deferred("fx", "parse_fx_table")
+generate_insights, generate_board_report, ask_cfo_question, generate_ai_optimization = deferred(
+    "ai_layer", "generate_insights", "generate_board_report", "ask_cfo_question", "generate_ai_optimization"
+)
+detect_anomalies = deferred("anomaly_detector", "detect_anomalies")
+forecast_cash = deferred("baseline", "forecast_cash")
+build_daily_flows, compute_daily_cash = deferred("daily_cash", "build_daily_flows", "compute_daily_cash")
+detect_recurring = deferred("recurring", "detect_recurring")
+compute_sensitivity, goal_seek, project_scenario, scenario_baseline = deferred(
+    "scenario", "compute_sensitivity", "goal_seek", "project_scenario", "scenario_baseline"
+)
+build_aggregates, compute_portfolio = deferred("portfolio", "build_aggregates", "compute_portfolio")
+build_timeseries_frames, compute_timeseries, timeseries_bucket, timeseries_columns = deferred(
+    "timeseries", "build_timeseries_frames", "compute_timeseries", "timeseries_bucket", "timeseries_columns"
+)
+build_ledger_index = deferred("ledger_index", "LedgerIndex")
+build_headcount_plan, plan_summary, with_planned_payroll = deferred(
+    "headcount", "build_headcount_plan", "plan_summary", "with_planned_payroll"
+)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    startup.mark("serving")
+    startup.start_warmup(_restore_snapshots)
+    yield
+
 
 # ── App + CORS ────────────────────────────────────────────────────────
-app = FastAPI(title="CFO.ai", version="0.1.0")
+app = FastAPI(title="CFO.ai", version="0.1.0", default_response_class=FastJSONResponse, lifespan=lifespan)
+
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,10 +75,44 @@ app.add_middleware(
 )
 
 # ── In-memory state ──────────────────────────────────────────────────
-GLOBAL_DF: Optional[pd.DataFrame] = None
+GLOBAL_DF: "Optional[pd.DataFrame]" = None
+DATASET_VERSION: int = 0  # new on every upload; keys derived caches
+LEDGER_INDEX: "Optional[LedgerIndex]" = None
+FX_RATES: "Optional[pd.DataFrame]" = None  # active rate table, survives uploads
+CLASSIFIER: "Optional[CategoryClassifier]" = None  # None = built-in aliases
+HEADCOUNT_PLAN: Optional[dict] = None  # built hiring plan, survives uploads
+
+# Every upload is also kept by id for portfolio views:
+# {dataset_id: {"version", "summary", "aggregates"}}.  Only the compact
+# aggregates are kept; the active ledger is GLOBAL_DF and frames of
+# older uploads live in their snapshots.
+DATASETS: dict[str, dict] = {}
+
+# Guards publishing (GLOBAL_DF, DATASET_VERSION, LEDGER_INDEX) and the
+# derived caches; heavy work happens outside it
+_STATE_LOCK = threading.Lock()
+_VERSIONS = itertools.count(1)
+
+# Derived payloads cached per dataset version
+# {version: {"frames": full-resolution matrices, "payloads": {bucket_months: payload}}}
+_TIMESERIES_CACHE: dict[int, dict] = {}
+_SCENARIO_BASE_CACHE: dict[int, dict] = {}
+_AGGREGATES_CACHE: dict[int, dict] = {}
+_DAILY_FLOWS_CACHE: dict[int, dict] = {}
+_RECURRING_CACHE: dict[int, dict] = {}
 
 DEFAULT_CASH_BALANCE: float = 400_000.0
 
+# Narrative engine: "ai" (Granite only), "rules" (local templates) or
+# "auto" (Granite within the latency budget, else templates)
+NARRATIVE_ENGINES = ("ai", "rules", "auto")
+DEFAULT_NARRATIVE_ENGINE: str = os.getenv("NARRATIVE_ENGINE", "auto")
+AI_LATENCY_BUDGET: float = float(os.getenv("AI_LATENCY_BUDGET", "8"))
+AI_WORKERS = 4
+_AI_POOL = ThreadPoolExecutor(max_workers=AI_WORKERS, thread_name_prefix="granite")
+# One slot per worker: "auto" never queues behind calls already running
+_AI_SLOTS = threading.BoundedSemaphore(AI_WORKERS)
+
 
 # ── Request / response models ────────────────────────────────────────
 class OptimizeRequest(BaseModel):
@@ -39,6 +120,9 @@ class OptimizeRequest(BaseModel):
     cash_balance: Optional[float] = Field(
         None, gt=0, description="Override cash balance"
     )
+    engine: Optional[str] = Field(None, pattern="^(ai|rules|auto)$", description="Narrative engine")
+    latency_budget: Optional[float] = Field(None, gt=0, description="Seconds to wait for AI in auto mode")
+    use_headcount_plan: bool = Field(False, description="Include the stored headcount plan in burn")
 
 
 class ScenarioRequest(BaseModel):
@@ -49,11 +133,80 @@ class ScenarioRequest(BaseModel):
     additional_monthly_cost: float = Field(0, ge=0, description="Any extra monthly cost")
     additional_monthly_revenue: float = Field(0, ge=0, description="Any extra monthly revenue")
     cash_balance: Optional[float] = Field(None, gt=0)
+    use_headcount_plan: bool = Field(
+        False,
+        description="Add the stored headcount plan's payroll: its monthly path on /scenario, "
+        "its average in burn on /sensitivity and /goal-seek",
+    )
+
+
+class SensitivityBound(BaseModel):
+    lever: str = Field(..., description="Scenario field, or 'category:<name>' for % spend change")
+    low: float
+    high: float
+
+
+class SensitivityRequest(ScenarioRequest):
+    bounds: Optional[list[SensitivityBound]] = Field(
+        None, description="Tornado ranges; defaults cover hiring, marketing, revenue and every category"
+    )
+
+
+class GoalSeekRequest(ScenarioRequest):
+    target_runway: Optional[float] = Field(None, gt=0, description="Months of runway to keep")
+    target_burn: Optional[float] = Field(None, description="Monthly net burn to hit")
+    free_variables: list[str] = Field(..., min_length=1, description="Scenario fields to solve for")
+    bounds: dict[str, tuple[float, float]] = Field(
+        default_factory=dict, description="(low, high) per free variable"
+    )
+
+
+class CategoryRule(BaseModel):
+    match: str = Field("exact", pattern="^(exact|prefix|keyword|regex)$")
+    field: str = Field("category", pattern="^(category|notes)$")
+    pattern: str = Field(..., min_length=1, max_length=500)
+    category: str = Field(..., min_length=1, max_length=100, description="Canonical category")
+    id: Optional[str] = Field(None, max_length=100)
+
+
+class CategoryRulesRequest(BaseModel):
+    rules: list[CategoryRule] = Field(
+        default_factory=list, description="Checked in order, before the built-in aliases"
+    )
+
+
+class HeadcountRole(BaseModel):
+    title: str = Field(..., min_length=1, max_length=100)
+    department: Optional[str] = Field(None, max_length=100)
+    count: int = Field(1, ge=1)
+    start_month: int = Field(..., ge=0, description="Months after the ledger's last month (0 = next month)")
+    end_month: Optional[int] = Field(None, ge=1, description="Exclusive; omit for open-ended roles")
+    monthly_salary: float = Field(..., ge=0)
+    burden_rate: Optional[float] = Field(
+        None, ge=0, le=2, description="Taxes/benefits as a share of salary (default 0.2)"
+    )
+
+
+class HeadcountPlanRequest(BaseModel):
+    roles: list[HeadcountRole] = Field(..., max_length=10_000)
+    horizon_months: int = Field(36, ge=1, le=120)
+
+
+class PortfolioRequest(BaseModel):
+    dataset_ids: Optional[list[str]] = Field(None, description="Defaults to every stored dataset")
+    cash_balances: dict[str, float] = Field(
+        default_factory=dict, description="Cash per dataset id; others use default_cash_balance"
+    )
+    default_cash_balance: Optional[float] = Field(None, gt=0)
+    rank_by: str = Field("runway", pattern="^(runway|burn|anomalies_found)$")
+    descending: bool = False
 
 
 class AskCFORequest(BaseModel):
     question: str = Field(..., min_length=3, max_length=1000)
     cash_balance: Optional[float] = Field(None, gt=0)
+    engine: Optional[str] = Field(None, pattern="^(ai|rules|auto)$", description="Narrative engine")
+    latency_budget: Optional[float] = Field(None, gt=0, description="Seconds to wait for AI in auto mode")
 
 
 # ── Endpoints ─────────────────────────────────────────────────────────
@@ -62,14 +215,25 @@ def health():
     return {"ok": True}
 
 
+@app.get("/startup")
+def startup_info():
+    """Startup mode, warm-up progress and import/startup timings."""
+    return {**startup.startup_report(), "datasets": len(DATASETS)}
+
+
 @app.get("/")
 def root():
     return RedirectResponse(url="http://localhost:3000")
 
 
 @app.post("/upload")
-async def upload(file: UploadFile = File(...)):
-    global GLOBAL_DF
+async def upload(
+    file: UploadFile = File(...),
+    dataset_id: str = Query("default", min_length=1, max_length=100, description="Store under this id"),
+    drop_invalid: bool = Query(False, description="Drop rows with bad dates/amounts instead of rejecting the file"),
+    max_issue_rows: int = Query(20, ge=0, le=1000, description="Example row numbers kept per quality issue"),
+):
+    global GLOBAL_DF, DATASET_VERSION, LEDGER_INDEX
 
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="Only .csv files are accepted.")
@@ -77,21 +241,217 @@ async def upload(file: UploadFile = File(...)):
     raw = await file.read()
 
     try:
-        df, summary = parse_and_validate_csv(raw)
+        df, summary = parse_and_validate_csv(
+            raw, FX_RATES, classifier=CLASSIFIER,
+            drop_invalid=drop_invalid, max_issue_rows=max_issue_rows,
+        )
     except ValueError as exc:
+        from data_quality import DataQualityError
+
+        if isinstance(exc, DataQualityError):
+            return JSONResponse(status_code=400, content={"detail": str(exc), "quality": exc.report})
         raise HTTPException(status_code=400, detail=str(exc))
 
-    GLOBAL_DF = df
-    return summary
+    version = next(_VERSIONS)
+    # Reduced once here so /portfolio and the baseline never re-read the ledger
+    aggregates = build_aggregates(df)
+    index = build_ledger_index(df, version)
+
+    with _STATE_LOCK:
+        GLOBAL_DF, DATASET_VERSION, LEDGER_INDEX = df, version, index
+        _TIMESERIES_CACHE.clear()
+        _AGGREGATES_CACHE.clear()
+        _AGGREGATES_CACHE[version] = aggregates
+        DATASETS[dataset_id] = {
+            "version": version, "summary": summary, "aggregates": aggregates
+        }
+    startup.save_snapshot(dataset_id, df, summary)
+    return {**summary, "dataset_id": dataset_id}
+
+
+def _restore_snapshots(snapshots: list[dict]) -> None:
+    """
+    Warm start: re-register snapshotted datasets, make the newest active
+    and pre-build its derived caches.  Skipped if an upload got there first.
+    """
+    global GLOBAL_DF, DATASET_VERSION, LEDGER_INDEX
+
+    if DATASET_VERSION:
+        return
+    restored = {
+        snap["dataset_id"]: {
+            "version": next(_VERSIONS), "summary": snap["summary"],
+            "aggregates": build_aggregates(snap["df"]),
+        }
+        for snap in snapshots
+    }
+    latest_df = snapshots[-1]["df"]
+    latest = restored[snapshots[-1]["dataset_id"]]
+    index = build_ledger_index(latest_df, latest["version"])
+
+    with _STATE_LOCK:
+        if DATASET_VERSION:
+            return
+        DATASETS.update(restored)
+        GLOBAL_DF, DATASET_VERSION, LEDGER_INDEX = latest_df, latest["version"], index
+        _AGGREGATES_CACHE.clear()
+        _AGGREGATES_CACHE[DATASET_VERSION] = latest["aggregates"]
+    _recurring()
+    _scenario_base()
+
+
+@app.post("/fx-rates")
+async def upload_fx_rates(file: UploadFile = File(...)):
+    """Set the FX rate table (date, currency, rate) used by later uploads."""
+    global FX_RATES
+
+    if not file.filename or not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Only .csv files are accepted.")
+
+    raw = await file.read()
+
+    try:
+        FX_RATES = parse_fx_table(raw)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return {
+        "rows": len(FX_RATES),
+        "currencies": sorted(FX_RATES["currency"].unique().tolist()),
+        "from": FX_RATES["date"].min().strftime("%Y-%m-%d"),
+        "to": FX_RATES["date"].max().strftime("%Y-%m-%d"),
+    }
+
+
+@app.post("/category-rules")
+def set_category_rules(body: CategoryRulesRequest):
+    """Install custom classification rules for subsequent uploads."""
+    global CLASSIFIER
+
+    try:
+        custom = build_classifier([r.model_dump() for r in body.rules])
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    from utils import DEFAULT_CLASSIFIER
+
+    CLASSIFIER = custom.extend(DEFAULT_CLASSIFIER)
+    return {"rules": len(custom.rules), "total_rules": len(CLASSIFIER.rules)}
+
+
+@app.get("/datasets")
+def list_datasets():
+    """Ids and upload summaries of every stored dataset."""
+    return {
+        "datasets": [
+            {"dataset_id": ds_id, "version": entry["version"], **entry["summary"]}
+            for ds_id, entry in DATASETS.items()
+        ]
+    }
+
+
+@app.delete("/datasets/{dataset_id}")
+def delete_dataset(dataset_id: str):
+    """
+    Drop a stored dataset from portfolio views and remove its snapshot.
+    The active ledger keeps serving until the next upload.
+    """
+    with _STATE_LOCK:
+        if DATASETS.pop(dataset_id, None) is None:
+            raise HTTPException(status_code=404, detail=f"Unknown dataset id: {dataset_id}")
+    startup.delete_snapshot(dataset_id)
+    return {"ok": True, "datasets": len(DATASETS)}
 
 
 @app.get("/metrics")
-def metrics(cash_balance: Optional[float] = Query(None)):
+def metrics(request: Request, cash_balance: Optional[float] = Query(None)):
     if GLOBAL_DF is None:
         raise HTTPException(status_code=400, detail="POST /upload first")
 
     bal = cash_balance if cash_balance is not None else DEFAULT_CASH_BALANCE
-    return compute_metrics(GLOBAL_DF, bal)
+    return encode_response(
+        request,
+        compute_metrics(GLOBAL_DF, bal),
+        table=lambda p: records_to_columns(p["expenses"]),
+    )
+
+
+def _cached(cache: dict, build: Callable[[Any], Any]) -> Any:
+    """
+    ``build(df)`` for the active dataset, cached per version.
+
+    (df, version) is read as one pair, and a result is only stored while
+    its version is still active, so an upload mid-build cannot leave a
+    stale entry under the new version.
+    """
+    with _STATE_LOCK:
+        df, version = GLOBAL_DF, DATASET_VERSION
+        hit = cache.get(version)
+    if hit is not None:
+        return hit
+    result = build(df)
+    with _STATE_LOCK:
+        if version == DATASET_VERSION:
+            cache.clear()
+            cache[version] = result
+    return result
+
+
+def _recurring() -> dict:
+    """Recurring vendor index for the active dataset, cached per version."""
+    return _cached(_RECURRING_CACHE, detect_recurring)
+
+
+@app.get("/recurring")
+def recurring(request: Request):
+    """Detected subscriptions / recurring vendors with monthly cost."""
+    if GLOBAL_DF is None:
+        raise HTTPException(status_code=400, detail="POST /upload first")
+    return encode_response(
+        request, _recurring(), table=lambda p: records_to_columns(p["subscriptions"])
+    )
+
+
+# ── Narrative engine ─────────────────────────────────────────────────
+def _narrate(
+    ai: Callable[[], object],
+    rules: Callable[[], object],
+    engine: Optional[str],
+    budget: Optional[float],
+) -> tuple[object, str]:
+    """
+    Run the Granite call *ai* or the template fallback *rules*.
+
+    ``auto`` waits at most *budget* seconds for Granite and answers from
+    the templates on timeout or error; a timed-out call is cancelled if
+    it has not started, and when every Granite worker is busy the
+    templates answer straight away.  ``ai`` keeps the strict behaviour
+    and raises 502.
+
+    Returns (result, engine actually used).
+    """
+    engine = engine or DEFAULT_NARRATIVE_ENGINE
+    if engine not in NARRATIVE_ENGINES:
+        raise HTTPException(status_code=400, detail=f"engine must be one of: {', '.join(NARRATIVE_ENGINES)}")
+
+    if engine == "rules":
+        return rules(), "rules"
+    if engine == "ai":
+        try:
+            return ai(), "ai"
+        except Exception as exc:
+            raise HTTPException(status_code=502, detail=f"AI service error: {exc}")
+
+    if not _AI_SLOTS.acquire(blocking=False):
+        return rules(), "rules"
+    future = _AI_POOL.submit(ai)
+    # Runs on completion and on cancellation alike
+    future.add_done_callback(lambda _: _AI_SLOTS.release())
+    try:
+        return future.result(timeout=budget or AI_LATENCY_BUDGET), "ai"
+    except Exception:
+        future.cancel()
+        return rules(), "rules"
 
 
 @app.post("/optimize")
@@ -100,20 +460,33 @@ def run_optimize(body: OptimizeRequest):
         raise HTTPException(status_code=400, detail="POST /upload first")
 
     bal = body.cash_balance if body.cash_balance is not None else DEFAULT_CASH_BALANCE
-    metrics_data = compute_metrics(GLOBAL_DF, bal)
+    headcount = _headcount(body.use_headcount_plan)
+    metrics_data = with_planned_payroll(compute_metrics(GLOBAL_DF, bal), headcount)
 
     # Try AI-generated plan first, fall back to algorithmic plan
-    try:
-        result = generate_ai_optimization(metrics_data, bal)
-    except Exception:
-        result = optimize(GLOBAL_DF, bal, body.months)
-        result["ai_generated"] = False
+    def algorithmic() -> dict:
+        plan = optimize(GLOBAL_DF, bal, body.months, _recurring(), headcount)
+        plan["ai_generated"] = False
+        return plan
 
+    try:
+        result, _ = _narrate(
+            lambda: generate_ai_optimization(metrics_data, bal, _recurring(), headcount),
+            algorithmic,
+            body.engine,
+            body.latency_budget,
+        )
+    except HTTPException:
+        result = algorithmic()
     return result
 
 
 @app.get("/insights")
-def insights(cash_balance: Optional[float] = Query(None)):
+def insights(
+    cash_balance: Optional[float] = Query(None),
+    engine: Optional[str] = Query(None, description="ai | rules | auto"),
+    latency_budget: Optional[float] = Query(None, gt=0, description="Seconds to wait for AI in auto mode"),
+):
     """Return a short CFO-style bullet summary of the current metrics."""
     if GLOBAL_DF is None:
         raise HTTPException(status_code=400, detail="POST /upload first")
@@ -121,12 +494,15 @@ def insights(cash_balance: Optional[float] = Query(None)):
     bal = cash_balance if cash_balance is not None else DEFAULT_CASH_BALANCE
     metrics_data = compute_metrics(GLOBAL_DF, bal)
 
-    try:
-        text = generate_insights(metrics_data)
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"AI service error: {exc}")
-
-    return {"insights": text}
+    text, used = _narrate(
+        lambda: generate_insights(metrics_data),
+        lambda: render_insights(
+            metrics_data, detect_anomalies(GLOBAL_DF, baseline=_baseline()), _recurring()
+        ),
+        engine,
+        latency_budget,
+    )
+    return {"insights": text, "engine": used}
 
 
 @app.post("/report")
@@ -136,18 +512,84 @@ def report(body: OptimizeRequest):
         raise HTTPException(status_code=400, detail="POST /upload first")
 
     bal = body.cash_balance if body.cash_balance is not None else DEFAULT_CASH_BALANCE
-    metrics_data = compute_metrics(GLOBAL_DF, bal)
-    optimization_data = optimize(GLOBAL_DF, bal, body.months)
+    headcount = _headcount(body.use_headcount_plan)
+    metrics_data = with_planned_payroll(compute_metrics(GLOBAL_DF, bal), headcount)
+    optimization_data = optimize(GLOBAL_DF, bal, body.months, _recurring(), headcount)
+
+    text, used = _narrate(
+        lambda: generate_board_report(metrics_data, optimization_data, headcount),
+        lambda: render_board_report(
+            metrics_data, optimization_data, detect_anomalies(GLOBAL_DF, baseline=_baseline())
+        ),
+        body.engine,
+        body.latency_budget,
+    )
+    return {"report": text, "engine": used}
+
+
+# ── Headcount planning ───────────────────────────────────────────────
+def _headcount(use: bool) -> Optional[dict]:
+    """The stored headcount plan when *use* is set, else None."""
+    if not use:
+        return None
+    if HEADCOUNT_PLAN is None:
+        raise HTTPException(status_code=400, detail="POST /headcount-plan first")
+    return HEADCOUNT_PLAN
+
+
+@app.post("/headcount-plan")
+def set_headcount_plan(body: HeadcountPlanRequest):
+    """Store a hiring plan and return its month-by-month payroll."""
+    global HEADCOUNT_PLAN
 
     try:
-        text = generate_board_report(metrics_data, optimization_data)
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"AI service error: {exc}")
+        HEADCOUNT_PLAN = build_headcount_plan(
+            [r.model_dump() for r in body.roles], body.horizon_months
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
-    return {"report": text}
+    return plan_summary(HEADCOUNT_PLAN)
+
+
+@app.get("/headcount-plan")
+def get_headcount_plan():
+    """The stored hiring plan's payroll, headcount and department paths."""
+    return plan_summary(_headcount(True))
+
+
+@app.delete("/headcount-plan")
+def clear_headcount_plan():
+    global HEADCOUNT_PLAN
+    HEADCOUNT_PLAN = None
+    return {"ok": True}
 
 
 # ── Scenario Simulation ──────────────────────────────────────────────
+def _scenario_params(body: ScenarioRequest) -> dict:
+    """The request's scenario lever values."""
+    from scenario import SCENARIO_LEVERS
+
+    return body.model_dump(include=set(SCENARIO_LEVERS))
+
+
+def _scenario_base() -> dict:
+    """Scenario baseline for the active dataset, cached per version."""
+    return _cached(_SCENARIO_BASE_CACHE, scenario_baseline)
+
+
+def _planned_base(use_headcount_plan: bool) -> dict:
+    """
+    Scenario baseline with the stored plan's average monthly payroll in
+    burn when requested, as ``optimize`` counts it.
+    """
+    base = _scenario_base()
+    headcount = _headcount(use_headcount_plan)
+    if headcount is None:
+        return base
+    return {**base, "burn": base["burn"] + headcount["avg_monthly_payroll"]}
+
+
 @app.post("/scenario")
 def run_scenario(body: ScenarioRequest):
     """Simulate a what-if scenario and return the impact on burn/runway."""
@@ -155,56 +597,183 @@ def run_scenario(body: ScenarioRequest):
         raise HTTPException(status_code=400, detail="POST /upload first")
 
     bal = body.cash_balance if body.cash_balance is not None else DEFAULT_CASH_BALANCE
-    current = compute_metrics(GLOBAL_DF, bal)
-    current_burn = current["burn"]
-    current_runway = current["runway"]
-
-    # Calculate adjustments
-    hire_cost = body.new_hires * body.avg_salary
-
-    # Marketing adjustment
-    expenses = current.get("expenses", [])
-    marketing_spend = 0
-    for e in expenses:
-        if e["category"].lower() in ("marketing", "ads"):
-            marketing_spend += e["amount"]
-    # monthly marketing
-    months_observed = max(len(GLOBAL_DF["month"].unique()), 1)
-    monthly_marketing = marketing_spend / months_observed
-    marketing_delta = monthly_marketing * (body.marketing_change_pct / 100)
-
-    # Revenue adjustment
-    monthly_revenue = float(GLOBAL_DF[GLOBAL_DF["amount"] > 0]["amount"].sum()) / months_observed
-    revenue_delta = monthly_revenue * (body.revenue_growth_pct / 100)
-
-    # New burn = old burn + new hiring + marketing change - revenue growth + extra costs - extra revenue
-    new_burn = current_burn + hire_cost + marketing_delta - revenue_delta + body.additional_monthly_cost - body.additional_monthly_revenue
-    new_runway = round(bal / new_burn, 2) if new_burn > 0 else None
+    return project_scenario(
+        _scenario_base(), bal, _scenario_params(body), _headcount(body.use_headcount_plan)
+    )
 
-    return {
-        "current_burn": round(current_burn, 2),
-        "new_burn": round(new_burn, 2),
-        "current_runway": current_runway,
-        "new_runway": new_runway,
-        "burn_change": round(new_burn - current_burn, 2),
-        "runway_change": round((new_runway or 0) - (current_runway or 0), 2) if new_runway and current_runway else None,
-        "breakdown": {
-            "hiring_cost": round(hire_cost, 2),
-            "marketing_delta": round(marketing_delta, 2),
-            "revenue_delta": round(revenue_delta, 2),
-            "additional_cost": round(body.additional_monthly_cost, 2),
-            "additional_revenue": round(body.additional_monthly_revenue, 2),
-        },
-    }
+
+@app.post("/sensitivity")
+def sensitivity(body: SensitivityRequest):
+    """Analytic runway gradients and tornado ranges around a scenario."""
+    if GLOBAL_DF is None:
+        raise HTTPException(status_code=400, detail="POST /upload first")
+
+    bal = body.cash_balance if body.cash_balance is not None else DEFAULT_CASH_BALANCE
+    bounds = [b.model_dump() for b in body.bounds] if body.bounds is not None else None
+    try:
+        return compute_sensitivity(
+            _planned_base(body.use_headcount_plan), bal, _scenario_params(body), bounds
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.post("/goal-seek")
+def run_goal_seek(body: GoalSeekRequest):
+    """Solve for scenario levers that hit a target runway or burn."""
+    if GLOBAL_DF is None:
+        raise HTTPException(status_code=400, detail="POST /upload first")
+
+    bal = body.cash_balance if body.cash_balance is not None else DEFAULT_CASH_BALANCE
+    try:
+        return goal_seek(
+            _planned_base(body.use_headcount_plan),
+            bal,
+            _scenario_params(body),
+            body.free_variables,
+            target_runway=body.target_runway,
+            target_burn=body.target_burn,
+            bounds=body.bounds,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+# ── Time Series ──────────────────────────────────────────────────────
+@app.get("/timeseries")
+def timeseries(request: Request, max_points: Optional[int] = Query(None, gt=0)):
+    """Month × category expense/revenue matrices with trend metrics."""
+    if GLOBAL_DF is None:
+        raise HTTPException(status_code=400, detail="POST /upload first")
+
+    # Downsampled views derive from the cached full-resolution frames and
+    # are keyed by bucket width, so at most one payload per width exists
+    series = _cached(_TIMESERIES_CACHE, lambda _: {"frames": build_timeseries_frames(_aggregates()), "payloads": {}})
+    bucket = timeseries_bucket(series["frames"], max_points)
+    if bucket not in series["payloads"]:
+        series["payloads"][bucket] = compute_timeseries(series["frames"], bucket)
+    return encode_response(request, series["payloads"][bucket], table=timeseries_columns)
+
+
+# ── Transactions ─────────────────────────────────────────────────────
+@app.get("/transactions")
+def transactions(
+    request: Request,
+    start_date: Optional[str] = Query(None, description="Inclusive, YYYY-MM-DD"),
+    end_date: Optional[str] = Query(None, description="Inclusive, YYYY-MM-DD"),
+    category: Optional[list[str]] = Query(None, description="Repeat for several categories"),
+    min_amount: Optional[float] = Query(None),
+    max_amount: Optional[float] = Query(None),
+    q: Optional[str] = Query(None, max_length=200, description="Substring search on notes"),
+    sort_by: str = Query("date"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+):
+    """Filtered, paginated slice of the uploaded ledger."""
+    if LEDGER_INDEX is None:
+        raise HTTPException(status_code=400, detail="POST /upload first")
+
+    try:
+        result = LEDGER_INDEX.query(
+            start_date=start_date,
+            end_date=end_date,
+            categories=category,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            search=q,
+            sort_by=sort_by,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return encode_response(
+        request, result, table=lambda p: records_to_columns(p["transactions"])
+    )
+
+
+# ── Portfolio ────────────────────────────────────────────────────────
+@app.post("/portfolio")
+def portfolio(request: Request, body: PortfolioRequest):
+    """Rank runway, burn and anomalies across many stored datasets."""
+    ids = body.dataset_ids if body.dataset_ids is not None else list(DATASETS)
+    unknown = [ds_id for ds_id in ids if ds_id not in DATASETS]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset ids: {', '.join(unknown)}")
+    if not ids:
+        raise HTTPException(status_code=400, detail="POST /upload first")
+
+    default_bal = body.default_cash_balance or DEFAULT_CASH_BALANCE
+    entries = [
+        (ds_id, DATASETS[ds_id]["aggregates"], body.cash_balances.get(ds_id, default_bal))
+        for ds_id in ids
+    ]
+
+    result = compute_portfolio(entries, body.rank_by, body.descending)
+    return encode_response(request, result, table=lambda p: records_to_columns(p["companies"]))
 
 
 # ── Anomaly Detection ────────────────────────────────────────────────
+def _aggregates() -> dict:
+    """Month × category aggregates of the active dataset, cached per version."""
+    return _cached(_AGGREGATES_CACHE, build_aggregates)
+
+
+def _baseline() -> dict:
+    """Seasonal baseline fitted on the active dataset's aggregates."""
+    return _aggregates()["baseline"]
+
+
 @app.get("/anomalies")
-def anomalies():
+def anomalies(request: Request):
     """Detect unusual spending spikes in the uploaded data."""
     if GLOBAL_DF is None:
         raise HTTPException(status_code=400, detail="POST /upload first")
-    return detect_anomalies(GLOBAL_DF)
+    return encode_response(
+        request,
+        detect_anomalies(GLOBAL_DF, baseline=_baseline()),
+        table=lambda p: records_to_columns(p["category_analysis"]),
+    )
+
+
+# ── Cash Forecast ────────────────────────────────────────────────────
+@app.get("/forecast")
+def forecast(
+    request: Request,
+    cash_balance: Optional[float] = Query(None),
+    horizon: int = Query(24, ge=1, le=120),
+    use_headcount_plan: bool = Query(False, description="Add the stored headcount plan's payroll"),
+):
+    """Month-by-month cash projection from the seasonal baseline."""
+    if GLOBAL_DF is None:
+        raise HTTPException(status_code=400, detail="POST /upload first")
+
+    bal = cash_balance if cash_balance is not None else DEFAULT_CASH_BALANCE
+    result = forecast_cash(_baseline(), bal, horizon, _headcount(use_headcount_plan))
+    return encode_response(
+        request,
+        result,
+        table=lambda p: {k: p[k] for k in ("months", "expense", "revenue", "net_burn", "cash")},
+    )
+
+
+@app.get("/daily-cash")
+def daily_cash(
+    request: Request,
+    cash_balance: Optional[float] = Query(None),
+    horizon_days: int = Query(90, ge=0, le=730),
+    include_series: bool = Query(True),
+):
+    """Daily balance, minimum-cash day and intra-month volatility."""
+    if GLOBAL_DF is None:
+        raise HTTPException(status_code=400, detail="POST /upload first")
+
+    bal = cash_balance if cash_balance is not None else DEFAULT_CASH_BALANCE
+    result = compute_daily_cash(_cached(_DAILY_FLOWS_CACHE, build_daily_flows), bal, horizon_days, include_series)
+    return encode_response(request, result, table=lambda p: records_to_columns(p["months"]))
 
 
 # ── Ask the CFO ──────────────────────────────────────────────────────
@@ -217,9 +786,15 @@ def ask_cfo(body: AskCFORequest):
     bal = body.cash_balance if body.cash_balance is not None else DEFAULT_CASH_BALANCE
     metrics_data = compute_metrics(GLOBAL_DF, bal)
 
-    try:
-        answer = ask_cfo_question(body.question, metrics_data)
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"AI service error: {exc}")
+    answer, used = _narrate(
+        lambda: ask_cfo_question(body.question, metrics_data, _recurring()),
+        lambda: answer_question(
+            body.question, metrics_data, _recurring(), detect_anomalies(GLOBAL_DF, baseline=_baseline())
+        ),
+        body.engine,
+        body.latency_budget,
+    )
+    return {"question": body.question, "answer": answer, "engine": used}
+
 
-    return {"question": body.question, "answer": answer}
+startup.mark("app_ready")
@@ -0,0 +1,291 @@
+"""
+narrative.py – Deterministic, template-driven CFO narrative.
+
+Rule-based counterpart to ``ai_layer``: the same insight bullets, board
+memo sections and Q&A answers, rendered straight from the structured
+output of ``compute_metrics``, ``detect_anomalies``, ``detect_recurring``
+and ``optimize``.  Pure string formatting over already-computed numbers,
+so it runs in well under a millisecond and never fails for lack of a
+network — the fallback whenever Granite is slow or unavailable.
+"""
+
+import re
+from typing import Any, Optional
+
+from figures import fmt_currency, months_of_runway
+
+# Matches ScenarioRequest.avg_salary when a question gives no salary
+DEFAULT_HIRE_SALARY = 15000.0
+
+_NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+_HIRE_COUNT = re.compile(
+    r"\b(\d+|" + "|".join(_NUMBER_WORDS) + r")\s+(?:new\s+|more\s+|additional\s+)?"
+    r"(?:\w+\s+)?(?:hires?|engineers?|people|employees?|staff|developers?|salespeople|reps?)\b"
+)
+_MONEY = re.compile(r"\$\s?([\d,]+(?:\.\d+)?)\s*(k)?", re.IGNORECASE)
+
+
+def _fmt_runway(runway: Optional[float]) -> str:
+    return f"{runway:.1f} months" if runway is not None else "unlimited (cash-flow positive)"
+
+
+def _expense_shares(metrics: dict[str, Any], limit: int = 3) -> list[tuple[str, float, float]]:
+    """(category, amount, % of total spend) for the largest categories."""
+    expenses = metrics.get("expenses", [])
+    total = sum(e.get("amount", 0) for e in expenses) or 1.0
+    return [
+        (e["category"], e["amount"], e["amount"] / total * 100)
+        for e in expenses[:limit]
+    ]
+
+
+def _position_line(metrics: dict[str, Any]) -> str:
+    burn = metrics.get("burn", 0)
+    cash = metrics.get("cash", 0)
+    runway = metrics.get("runway")
+    if runway is None:
+        return (
+            f"Cash on hand is {fmt_currency(cash)} and revenue covers spending "
+            f"(net burn {fmt_currency(burn)}/month), so the company is cash-flow positive."
+        )
+    return (
+        f"Monthly net burn is {fmt_currency(burn)} against {fmt_currency(cash)} "
+        f"of cash, giving {runway:.1f} months of runway."
+    )
+
+
+def _drivers_line(metrics: dict[str, Any]) -> Optional[str]:
+    shares = _expense_shares(metrics)
+    if not shares:
+        return None
+    parts = ", ".join(f"{cat} ({fmt_currency(amt)}, {pct:.0f}%)" for cat, amt, pct in shares)
+    return f"Top expense categories: {parts}."
+
+
+def _anomaly_line(anomalies: Optional[dict[str, Any]], limit: int = 2) -> Optional[str]:
+    if not anomalies:
+        return None
+    alerts = anomalies.get("alerts", [])
+    if not alerts:
+        return f"No unusual spending across {anomalies.get('categories_analyzed', 0)} categories this period."
+    head = "; ".join(a["message"] for a in alerts[:limit])
+    more = f" (+{len(alerts) - limit} more)" if len(alerts) > limit else ""
+    return f"{len(alerts)} spending anomal{'y' if len(alerts) == 1 else 'ies'} flagged: {head}{more}."
+
+
+def _recurring_line(recurring: Optional[dict[str, Any]], limit: int = 3) -> Optional[str]:
+    if not recurring or not recurring.get("subscriptions"):
+        return None
+    active = [s for s in recurring["subscriptions"] if s["active"]][:limit]
+    if not active:
+        return None
+    names = ", ".join(f"{s['vendor']} ({fmt_currency(s['monthly_cost'])})" for s in active)
+    return (
+        f"Recurring vendors commit {fmt_currency(recurring['total_monthly_recurring'])}/month; "
+        f"largest: {names}."
+    )
+
+
+def _takeaway(metrics: dict[str, Any]) -> str:
+    runway = metrics.get("runway")
+    shares = _expense_shares(metrics, limit=1)
+    top = shares[0][0] if shares else "discretionary spend"
+    if runway is None:
+        return "Takeaway: the business is self-funding; reinvest selectively while protecting margin."
+    if runway < 6:
+        return f"Takeaway: runway is critically short — cut {top} and raise or reduce burn immediately."
+    if runway < 12:
+        return f"Takeaway: under a year of runway — start fundraising and tighten {top} now."
+    if runway < 18:
+        return f"Takeaway: runway is adequate; keep {top} in check ahead of the next raise."
+    return "Takeaway: runway is comfortable; focus spend on growth with clear ROI."
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  Insights
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def render_insights(
+    metrics: dict[str, Any],
+    anomalies: Optional[dict[str, Any]] = None,
+    recurring: Optional[dict[str, Any]] = None,
+) -> str:
+    """
+    Bullet summary equivalent to ``ai_layer.generate_insights``.
+
+    Returns
+    -------
+    str  – 3-6 lines, each starting with "- ".
+    """
+    lines = [
+        _position_line(metrics),
+        _drivers_line(metrics),
+        _anomaly_line(anomalies),
+        _recurring_line(recurring),
+        _takeaway(metrics),
+    ]
+    return "\n".join(f"- {line}" for line in lines if line)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  Board report
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _plan_lines(optimization: dict[str, Any]) -> list[str]:
+    lines = []
+    for step in optimization.get("plan", []):
+        vendors = step.get("vendors")
+        hit = f" (hits {', '.join(v['vendor'] for v in vendors)})" if vendors else ""
+        lines.append(f"- {step['action']}: saves {fmt_currency(step.get('monthly_savings_est', 0))}/month{hit}")
+    return lines
+
+
+def _risk_lines(optimization: dict[str, Any]) -> list[str]:
+    risks = []
+    categories = {s.get("category") for s in optimization.get("plan", [])}
+    actions = " ".join(s.get("action", "") for s in optimization.get("plan", [])).lower()
+    if "Payroll" in categories or "hire" in actions:
+        risks.append("- Payroll cuts or delayed hires slow delivery and can hurt retention.")
+    if "Marketing" in categories:
+        risks.append("- Lower marketing spend may reduce pipeline and delay revenue growth.")
+    if "renegotiate" in actions or "Cloud" in categories or "SaaS" in categories:
+        risks.append("- Vendor renegotiation depends on counterparties; savings may take a cycle to land.")
+    if optimization.get("note") and "best-effort" in optimization["note"]:
+        risks.append("- The plan does not fully reach the target runway; additional funding may be needed.")
+    if not risks:
+        risks.append("- Broad percentage cuts risk degrading service quality if applied without review.")
+    return risks[:3]
+
+
+def render_board_report(
+    metrics: dict[str, Any],
+    optimization: dict[str, Any],
+    anomalies: Optional[dict[str, Any]] = None,
+) -> str:
+    """
+    Executive memo with the same ``##`` sections as
+    ``ai_layer.generate_board_report``.
+    """
+    before = optimization.get("monthly_burn_before", metrics.get("burn", 0))
+    after = optimization.get("monthly_burn_after", before)
+    new_runway = optimization.get("new_runway")
+    current = optimization.get("current_runway", metrics.get("runway"))
+    savings = before - after
+
+    sections = ["## Executive Summary", _position_line(metrics)]
+    if optimization.get("plan"):
+        sections.append(
+            f"The proposed plan saves {fmt_currency(savings)}/month, moving runway from "
+            f"{_fmt_runway(current)} to {_fmt_runway(new_runway)}."
+        )
+
+    sections += ["", "## Current Financial Position",
+                 f"- Cash on hand: {fmt_currency(metrics.get('cash', 0))}",
+                 f"- Monthly net burn: {fmt_currency(metrics.get('burn', 0))}",
+                 f"- Runway: {_fmt_runway(metrics.get('runway'))}"]
+    sections += [f"- {cat}: {fmt_currency(amt)} ({pct:.0f}% of spend)" for cat, amt, pct in _expense_shares(metrics)]
+    anomaly = _anomaly_line(anomalies)
+    if anomaly:
+        sections.append(f"- {anomaly}")
+
+    sections += ["", "## Optimization Plan"]
+    plan = _plan_lines(optimization)
+    if plan:
+        sections += plan
+        sections.append(
+            f"- Projected burn {fmt_currency(after)}/month; runway {_fmt_runway(new_runway)}."
+        )
+    else:
+        sections.append(f"- {optimization.get('note', 'No cuts required.')}")
+
+    sections += ["", "## Risks & Tradeoffs"] + _risk_lines(optimization)
+
+    sections += ["", "## Final Recommendation"]
+    if current is None:
+        sections.append("Maintain current spending discipline; no cuts are required to preserve runway.")
+    elif plan:
+        sections.append(
+            f"Approve the plan in order of savings, starting with {optimization['plan'][0]['action'].lower()}, "
+            f"and review results monthly against the {_fmt_runway(new_runway)} target."
+        )
+    else:
+        sections.append(_takeaway(metrics).removeprefix("Takeaway: ").capitalize())
+
+    return "\n".join(sections)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  Ask CFO
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _hire_answer(question: str, metrics: dict[str, Any]) -> str:
+    count_match = _HIRE_COUNT.search(question)
+    count = 1
+    if count_match:
+        token = count_match.group(1)
+        count = int(token) if token.isdigit() else _NUMBER_WORDS[token]
+
+    money = _MONEY.search(question)
+    salary = DEFAULT_HIRE_SALARY
+    if money:
+        salary = float(money.group(1).replace(",", "")) * (1000 if money.group(2) else 1)
+        if salary > 100_000:  # quoted as annual
+            salary /= 12
+
+    burn = metrics.get("burn", 0)
+    cash = metrics.get("cash", 0)
+    new_burn = burn + count * salary
+    before, after = metrics.get("runway"), months_of_runway(cash, new_burn)
+    verdict = (
+        "Affordable: runway stays above 12 months." if after is None or after >= 12
+        else "Proceed with caution: runway drops below 12 months." if after >= 6
+        else "Not recommended: runway would fall below 6 months."
+    )
+    return "\n".join([
+        f"- Hiring {count} at {fmt_currency(salary)}/month adds {fmt_currency(count * salary)} to monthly burn.",
+        f"- Burn: {fmt_currency(burn)} → {fmt_currency(new_burn)}",
+        f"- Runway: {_fmt_runway(before)} → {_fmt_runway(after)}",
+        f"- {verdict}",
+    ])
+
+
+def _savings_answer(metrics: dict[str, Any], recurring: Optional[dict[str, Any]]) -> str:
+    lines = [f"- {_position_line(metrics)}"]
+    for cat, amt, pct in _expense_shares(metrics):
+        lines.append(f"- {cat} is {pct:.0f}% of spend ({fmt_currency(amt)}); a 10% cut saves {fmt_currency(amt * 0.1)} over the period.")
+    vendors = _recurring_line(recurring)
+    if vendors:
+        lines.append(f"- {vendors} Renegotiating these is the lowest-risk saving.")
+    lines.append("- Recommendation: start with the largest non-payroll category before touching headcount.")
+    return "\n".join(lines)
+
+
+def answer_question(
+    question: str,
+    metrics: dict[str, Any],
+    recurring: Optional[dict[str, Any]] = None,
+    anomalies: Optional[dict[str, Any]] = None,
+) -> str:
+    """
+    Keyword-routed answer equivalent to ``ai_layer.ask_cfo_question``.
+
+    Hiring questions are costed against current burn (count and salary
+    are read from the question when given); cost, vendor, anomaly,
+    burn and runway questions each get a templated answer, and anything
+    else gets the insight summary.
+    """
+    q = question.lower()
+    if re.search(r"\bhir(e|es|ing)\b|engineer|headcount", q):
+        return _hire_answer(q, metrics)
+    if re.search(r"\b(cut|save|saving|reduce|lower|optimi[sz]e)", q):
+        return _savings_answer(metrics, recurring)
+    if re.search(r"vendor|subscription|recurring|contract", q):
+        return f"- {_recurring_line(recurring) or 'No recurring vendors detected in this ledger.'}"
+    if re.search(r"anomal|spike|unusual|outlier", q):
+        return f"- {_anomaly_line(anomalies) or 'Anomaly data is not available.'}"
+    if re.search(r"runway|burn|how long|cash", q):
+        return f"- {_position_line(metrics)}\n- {_takeaway(metrics)}"
+    return render_insights(metrics, anomalies, recurring)
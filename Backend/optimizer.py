@@ -2,12 +2,22 @@
 optimizer.py – Greedy runway-extension heuristic.
 """
 
-from typing import Any
+from typing import Any, Optional
 
 import pandas as pd
 
+from figures import months_of_runway
 from financial_engine import compute_metrics
 
+# Share of a recurring vendor's monthly cost assumed recoverable by renegotiation
+RENEGOTIATION_SAVINGS = 0.10
+
+# Nominal saving of "Delay 1 hire" when no headcount plan is supplied
+DEFAULT_HIRE_DELAY_SAVINGS = 8000
+
+# How far a planned hire is pushed back by a delay action
+HIRE_DELAY_MONTHS = 3
+
 
 def _compute_burn(df: pd.DataFrame) -> float:
     """Return average monthly net burn from a DataFrame."""
@@ -20,24 +30,83 @@ def _compute_burn(df: pd.DataFrame) -> float:
     return (total_expense - total_revenue) / n_months
 
 
-def _runway(cash: float, burn: float) -> float | None:
-    if burn <= 0:
-        return None  # infinite
-    return round(cash / burn, 2)
+def _vendor_targets(recurring: Optional[dict[str, Any]], category: str, limit: int = 3) -> list[dict]:
+    """Largest active recurring vendors billed under *category*."""
+    if not recurring:
+        return []
+    return [
+        {"vendor": s["vendor"], "cadence": s["cadence"], "monthly_cost": s["monthly_cost"]}
+        for s in recurring["subscriptions"]
+        if s["active"] and s["category"] == category
+    ][:limit]
+
+
+def _hire_delays(headcount: Optional[dict[str, Any]], limit: int = 3) -> list[dict[str, Any]]:
+    """
+    Delay actions for the planned roles whose delay saves the most.
+
+    Pushing a role back HIRE_DELAY_MONTHS removes that many of its
+    active months from the plan, so average burn over the horizon falls
+    by ``monthly_cost * months / horizon``.
+    """
+    if headcount is None:
+        return [
+            {
+                "action": "Delay 1 hire",
+                "category": None,
+                "cut_pct": None,
+                "monthly_savings_est": DEFAULT_HIRE_DELAY_SAVINGS,
+            }
+        ]
+    horizon = headcount["horizon"]
+    savings = sorted(
+        (
+            (round(r["monthly_cost"] * min(HIRE_DELAY_MONTHS, r["active_months"]) / horizon, 2), r)
+            for r in headcount["roles"]
+            if r["active_months"] > 0
+        ),
+        key=lambda pair: pair[0],
+        reverse=True,
+    )[:limit]
+    return [
+        {
+            "action": (
+                f"Delay {r['title']} hire{'s' if r['count'] > 1 else ''} by {HIRE_DELAY_MONTHS} months "
+                f"(planned month {r['start_month']})"
+            ),
+            "category": "Payroll",
+            "cut_pct": None,
+            "role": r["title"],
+            "delay_months": HIRE_DELAY_MONTHS,
+            "monthly_savings_est": saving,
+        }
+        for saving, r in savings
+    ]
 
 
 def optimize(
     df: pd.DataFrame,
     cash_balance: float,
     extend_by_months: float,
+    recurring: Optional[dict[str, Any]] = None,
+    headcount: Optional[dict[str, Any]] = None,
 ) -> dict[str, Any]:
     """
     Build a greedy cost-cutting plan to extend runway by *extend_by_months*.
 
+    If *recurring* (output of ``recurring.detect_recurring``) is given,
+    category cuts list the vendors they would hit and the generic
+    contract renegotiation is replaced by vendor-specific ones.
+
+    If *headcount* (output of ``headcount.build_headcount_plan``) is
+    given, its average monthly payroll is added to burn and the generic
+    "Delay 1 hire" becomes delays of the planned roles that save most.
+
     Returns the optimisation response dict.
     """
-    burn_before = _compute_burn(df)
-    current_runway = _runway(cash_balance, burn_before)
+    planned_payroll = headcount["avg_monthly_payroll"] if headcount is not None else 0.0
+    burn_before = _compute_burn(df) + planned_payroll
+    current_runway = months_of_runway(cash_balance, burn_before)
 
     # ── Edge: already infinite runway ─────────────────────────────────
     if current_runway is None:
@@ -80,17 +149,18 @@ def optimize(
 
             work_df.loc[mask, "amount"] = work_df.loc[mask, "amount"] * (1 - cut_pct)
 
-            new_burn = _compute_burn(work_df)
-            new_rwy = _runway(cash_balance, new_burn)
+            new_burn = _compute_burn(work_df) + planned_payroll
+            new_rwy = months_of_runway(cash_balance, new_burn)
 
-            plan.append(
-                {
-                    "action": f"Cut {category} by {int(cut_pct*100)}%",
-                    "category": category,
-                    "cut_pct": cut_pct,
-                    "monthly_savings_est": monthly_savings_est,
-                }
-            )
+            action = {
+                "action": f"Cut {category} by {int(cut_pct*100)}%",
+                "category": category,
+                "cut_pct": cut_pct,
+                "monthly_savings_est": monthly_savings_est,
+            }
+            if recurring is not None:
+                action["vendors"] = _vendor_targets(recurring, category)
+            plan.append(action)
 
             # Check stop conditions
             if new_rwy is None:
@@ -119,26 +189,37 @@ def optimize(
             # then next category)
 
     # ── Special demo-friendly fallback actions ────────────────────────
-    special_actions = [
-        {
-            "action": "Delay 1 hire",
-            "category": None,
-            "cut_pct": None,
-            "monthly_savings_est": 8000,
-        },
-        {
-            "action": "Renegotiate cloud contract",
-            "category": None,
-            "cut_pct": None,
-            "monthly_savings_est": 1500,
-        },
-    ]
+    special_actions = _hire_delays(headcount)
+    vendors = [
+        s for s in (recurring or {}).get("subscriptions", [])
+        if s["active"] and s["category"] != "Payroll"
+    ][:3]
+    if vendors:
+        special_actions += [
+            {
+                "action": f"Renegotiate {v['vendor']} ({v['cadence']}) contract",
+                "category": v["category"],
+                "cut_pct": None,
+                "vendor": v["vendor"],
+                "monthly_savings_est": round(v["monthly_cost"] * RENEGOTIATION_SAVINGS, 2),
+            }
+            for v in vendors
+        ]
+    else:
+        special_actions.append(
+            {
+                "action": "Renegotiate cloud contract",
+                "category": None,
+                "cut_pct": None,
+                "monthly_savings_est": 1500,
+            }
+        )
 
-    new_burn = _compute_burn(work_df)
+    new_burn = _compute_burn(work_df) + planned_payroll
     for sa in special_actions:
         new_burn -= sa["monthly_savings_est"]
         plan.append(sa)
-        new_rwy = _runway(cash_balance, new_burn)
+        new_rwy = months_of_runway(cash_balance, new_burn)
 
         if new_rwy is None or new_rwy >= target_runway:
             return {
@@ -151,7 +232,7 @@ def optimize(
             }
 
     # Best effort – couldn't fully reach target
-    new_rwy = _runway(cash_balance, new_burn)
+    new_rwy = months_of_runway(cash_balance, new_burn)
     return {
         "current_runway": current_runway,
         "target_runway": target_runway,
@@ -0,0 +1,114 @@
+"""
+portfolio.py – Cross-company metrics, runway and anomaly ranking.
+
+Each stored dataset is reduced once, at upload, to compact month ×
+category arrays and a fitted baseline (see ``build_aggregates``).
+Portfolio calls only score those arrays, a few array reductions per
+company, so no ledger is re-read and ranking stays inline.
+"""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from baseline import fit_baseline, latest_z_scores
+from figures import months_of_runway
+from timeseries import build_month_category_matrix
+
+RANK_FIELDS = ("runway", "burn", "anomalies_found")
+
+
+def build_aggregates(df: pd.DataFrame) -> dict[str, Any]:
+    """
+    Reduce a ledger to the arrays needed for portfolio scoring.
+
+    Returns
+    -------
+    dict with ``months``, ``categories``, dense ``expense``/``revenue``
+    matrices (months × categories), an ``observed`` mask of months
+    that actually contain transactions, and the fitted ``baseline``.
+    """
+    expense, revenue = build_month_category_matrix(df)
+    categories = expense.columns.union(revenue.columns)
+    expense = expense.reindex(columns=categories, fill_value=0.0)
+    revenue = revenue.reindex(columns=categories, fill_value=0.0)
+    aggregates = {
+        "months": [str(m) for m in expense.index],
+        "categories": [str(c) for c in categories],
+        "expense": expense.to_numpy(dtype=float),
+        "revenue": revenue.to_numpy(dtype=float),
+        "observed": expense.index.isin(df["month"].unique()),
+    }
+    aggregates["baseline"] = fit_baseline(**aggregates)
+    return aggregates
+
+
+def score_dataset(
+    dataset_id: str,
+    aggregates: dict[str, Any],
+    cash_balance: float,
+    threshold: float = 1.5,
+) -> dict[str, Any]:
+    """One portfolio row: burn, runway, top category and anomaly count."""
+    expense = aggregates["expense"]
+    revenue = aggregates["revenue"]
+    observed = aggregates["observed"]
+
+    monthly_net = (expense.sum(axis=1) - revenue.sum(axis=1))[observed]
+    burn = float(monthly_net.mean()) if len(monthly_net) else 0.0
+    runway = months_of_runway(cash_balance, burn)
+
+    cat_totals = expense.sum(axis=0)
+    top = (
+        aggregates["categories"][int(np.argmax(cat_totals))]
+        if len(cat_totals) and cat_totals.max() > 0 else None
+    )
+
+    return {
+        "dataset_id": dataset_id,
+        "cash": cash_balance,
+        "burn": round(burn, 2),
+        "runway": runway,
+        "months_observed": int(observed.sum()),
+        "latest_month": aggregates["months"][-1] if aggregates["months"] else None,
+        "top_expense_category": top,
+        "top_expense_share_pct": (
+            round(float(cat_totals.max() / cat_totals.sum() * 100), 1) if top else None
+        ),
+        "anomalies_found": int((np.abs(latest_z_scores(aggregates["baseline"])) > threshold).sum()),
+    }
+
+
+def compute_portfolio(
+    entries: list[tuple[str, dict[str, Any], float]],
+    rank_by: str = "runway",
+    descending: bool = False,
+) -> dict[str, Any]:
+    """
+    Score every ``(dataset_id, aggregates, cash_balance)`` entry and rank.
+
+    With the default ``runway`` ascending, the companies closest to
+    running out of cash come first; infinite runway always sorts last.
+    """
+    if rank_by not in RANK_FIELDS:
+        raise ValueError(f"rank_by must be one of: {', '.join(RANK_FIELDS)}")
+
+    rows = [score_dataset(ds_id, agg, cash) for ds_id, agg, cash in entries]
+
+    present = [r for r in rows if r[rank_by] is not None]
+    missing = [r for r in rows if r[rank_by] is None]
+    present.sort(key=lambda r: r[rank_by], reverse=descending)
+    ranked = present + missing
+    for i, row in enumerate(ranked, start=1):
+        row["rank"] = i
+
+    finite = [r["runway"] for r in rows if r["runway"] is not None]
+    return {
+        "datasets": len(rows),
+        "rank_by": rank_by,
+        "median_runway": round(float(np.median(finite)), 2) if finite else None,
+        "total_burn": round(sum(r["burn"] for r in rows), 2),
+        "cash_flow_positive": len(rows) - len(finite),
+        "companies": ranked,
+    }
@@ -0,0 +1,160 @@
+"""
+recurring.py – Recurring payment (subscription/vendor) detection.
+
+Expense rows are keyed by a normalised vendor signature taken from the
+notes (digits, month names, billing boilerplate and "+ ..." annotations
+removed), falling back to the category when notes are missing.  Each
+vendor is then split into amount bands (sorted amounts break wherever
+one is more than AMOUNT_BAND_RATIO × the previous), so a $300 seat fee
+and a $4,000 usage bill from the same vendor are separate streams.  One
+sort by (stream, date) lets every inter-payment interval be computed
+with a single diff, and cadence is read off each group's median interval.
+"""
+
+import re
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# (name, median interval in days, tolerance in days, min occurrences)
+CADENCES: tuple[tuple[str, float, float, int], ...] = (
+    ("weekly", 7, 2, 4),
+    ("monthly", 30.44, 5, 3),
+    ("quarterly", 91.3, 12, 3),
+    ("annual", 365.25, 25, 2),
+)
+
+AVG_MONTH_DAYS = 30.44
+
+# A vendor's charges start a new stream where the next-larger amount is
+# more than this multiple of the previous one
+AMOUNT_BAND_RATIO = 1.5
+
+_NOISE_WORDS = {
+    "jan", "january", "feb", "february", "mar", "march", "apr", "april", "may",
+    "jun", "june", "jul", "july", "aug", "august", "sep", "sept", "september",
+    "oct", "october", "nov", "november", "dec", "december",
+    "bill", "billing", "invoice", "payment", "subscription", "charge", "fee",
+    "monthly", "annual", "yearly", "renewal", "inc", "llc", "ltd", "co",
+}
+_ANNOTATION = re.compile(r"\s[+(\-–].*$")
+_NON_ALPHA = re.compile(r"[^a-z\s]")
+
+
+def normalize_vendor(raw: str) -> str:
+    """Reduce a free-text note to a stable vendor signature."""
+    text = _ANNOTATION.sub("", str(raw).lower().strip())
+    words = [w for w in _NON_ALPHA.sub(" ", text).split() if w not in _NOISE_WORDS]
+    return " ".join(words)
+
+
+def detect_recurring(df: pd.DataFrame) -> dict[str, Any]:
+    """
+    Find recurring expense streams and their monthly-equivalent cost.
+
+    Returns
+    -------
+    dict with ``subscriptions`` (one per vendor stream, sorted by
+    monthly cost desc), ``total_monthly_recurring`` and ``vendors_detected``.
+    """
+    expenses = df[df["amount"] < 0]
+    if expenses.empty:
+        return {"subscriptions": [], "total_monthly_recurring": 0.0, "vendors_detected": 0}
+
+    # ── Vendor signature, computed once per distinct note ────────────
+    if "notes" in expenses.columns:
+        raw = expenses["notes"].fillna("").astype(str)
+    else:
+        raw = pd.Series("", index=expenses.index)
+    codes, uniques = pd.factorize(raw)
+    signatures = np.array([normalize_vendor(u) for u in uniques], dtype=object)[codes]
+    fallback = expenses["category"].astype(str).str.lower().to_numpy()
+    signatures = np.where(signatures == "", fallback, signatures)
+
+    frame = pd.DataFrame(
+        {
+            "vendor": signatures,
+            "category": expenses["category"].to_numpy(),
+            "date": expenses["date"].to_numpy(dtype="datetime64[ns]"),
+            "amount": -expenses["amount"].to_numpy(dtype=float),
+        }
+    ).sort_values(["vendor", "amount"], kind="stable")
+
+    # ── Amount bands: one stream per cluster of similar amounts ──────
+    vendor_arr = frame["vendor"].to_numpy()
+    amounts = frame["amount"].to_numpy()
+    new_stream = np.r_[
+        True, (vendor_arr[1:] != vendor_arr[:-1]) | (amounts[1:] > amounts[:-1] * AMOUNT_BAND_RATIO)
+    ]
+    frame["stream"] = np.cumsum(new_stream)
+    frame = frame.sort_values(["stream", "date"], kind="stable")
+
+    # ── Intervals between consecutive charges of the same stream ─────
+    stream_arr = frame["stream"].to_numpy()
+    days = frame["date"].to_numpy(dtype="datetime64[D]").astype(np.int64)
+    same = np.r_[False, stream_arr[1:] == stream_arr[:-1]]
+    gaps = np.where(same, np.r_[0, np.diff(days)], np.nan)
+    frame["gap"] = gaps
+
+    grouped = frame.groupby("stream", sort=False)
+    stats = grouped.agg(
+        vendor=("vendor", "first"),
+        category=("category", "last"),
+        occurrences=("amount", "size"),
+        median_amount=("amount", "median"),
+        mean_amount=("amount", "mean"),
+        std_amount=("amount", "std"),
+        last_amount=("amount", "last"),
+        first_date=("date", "min"),
+        last_date=("date", "max"),
+        median_gap=("gap", "median"),
+    )
+
+    # ── Cadence classification (vectorised over vendors) ─────────────
+    cadence = np.full(len(stats), None, dtype=object)
+    median_gap = stats["median_gap"].to_numpy()
+    occurrences = stats["occurrences"].to_numpy()
+    for name, period, tol, min_n in CADENCES:
+        hit = (np.abs(median_gap - period) <= tol) & (occurrences >= min_n) & (cadence == None)  # noqa: E711
+        cadence[hit] = name
+    stats["cadence"] = cadence
+    stats = stats[stats["cadence"].notna()].copy()
+
+    # A vendor with several recurring streams is labelled by amount
+    split = stats["vendor"].duplicated(keep=False)
+    stats.loc[split, "vendor"] = [
+        f"{v} (~${a:,.0f})" for v, a in zip(stats.loc[split, "vendor"], stats.loc[split, "median_amount"])
+    ]
+
+    ledger_end = df["date"].max()
+    nominal = {name: period for name, period, _, _ in CADENCES}
+    stats["monthly_cost"] = stats["median_amount"] * AVG_MONTH_DAYS / stats["cadence"].map(nominal)
+    stats["next_expected"] = stats["last_date"] + pd.to_timedelta(stats["median_gap"].round(), unit="D")
+    stats["active"] = (ledger_end - stats["last_date"]).dt.days <= stats["median_gap"] * 1.5
+    stats["amount_cv"] = (stats["std_amount"] / stats["mean_amount"]).fillna(0.0)
+    stats = stats.sort_values("monthly_cost", ascending=False)
+
+    subscriptions = [
+        {
+            "vendor": str(row.vendor),
+            "category": str(row.category),
+            "cadence": row.cadence,
+            "occurrences": int(row.occurrences),
+            "monthly_cost": round(float(row.monthly_cost), 2),
+            "last_amount": round(float(row.last_amount), 2),
+            "last_date": row.last_date.strftime("%Y-%m-%d"),
+            "next_expected": row.next_expected.strftime("%Y-%m-%d"),
+            "amount_cv": round(float(row.amount_cv), 3),
+            "active": bool(row.active),
+        }
+        for row in stats.itertuples()
+    ]
+
+    return {
+        "subscriptions": subscriptions,
+        "total_monthly_recurring": round(
+            sum(s["monthly_cost"] for s in subscriptions if s["active"]), 2
+        ),
+        "vendors_detected": len(subscriptions),
+    }
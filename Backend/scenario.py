@@ -0,0 +1,422 @@
+"""
+scenario.py – What-if burn/runway projection and runway sensitivities.
+
+Scenario burn is linear in every lever:
+
+    new_burn = burn
+             + new_hires * avg_salary
+             + monthly_marketing * marketing_change_pct / 100
+             - monthly_revenue * revenue_growth_pct / 100
+             + additional_monthly_cost - additional_monthly_revenue
+
+and runway = cash / new_burn, so all derivatives are closed-form.
+A headcount plan (see ``headcount``) adds its month-by-month payroll on
+top of that steady-state burn as a separate projected path.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from baseline import path_runway
+from figures import months_of_runway
+from financial_engine import compute_metrics
+from headcount import payroll_path
+
+SCENARIO_LEVERS = (
+    "new_hires",
+    "avg_salary",
+    "marketing_change_pct",
+    "revenue_growth_pct",
+    "additional_monthly_cost",
+    "additional_monthly_revenue",
+)
+CATEGORY_LEVER_PREFIX = "category:"
+
+# Tornado ranges used when the caller supplies none: (low, high) as
+# offsets from the scenario point, category levers in % of spend.
+DEFAULT_TORNADO_OFFSETS: dict[str, tuple[float, float]] = {
+    "new_hires": (0, 5),
+    "marketing_change_pct": (-50, 50),
+    "revenue_growth_pct": (-20, 20),
+}
+DEFAULT_CATEGORY_OFFSETS: tuple[float, float] = (-20, 20)
+
+
+def scenario_baseline(df: pd.DataFrame) -> dict[str, Any]:
+    """
+    Cash-independent monthly aggregates that every scenario starts from.
+
+    Returns
+    -------
+    dict with ``burn``, ``monthly_marketing``, ``monthly_revenue`` and
+    ``category_monthly`` ({category: avg monthly spend}).
+    """
+    current = compute_metrics(df, 0.0)
+    months_observed = max(len(df["month"].unique()), 1)
+
+    marketing_spend = sum(
+        e["amount"] for e in current["expenses"] if e["category"].lower() in ("marketing", "ads")
+    )
+    return {
+        "burn": current["burn"],
+        "months_observed": months_observed,
+        "monthly_marketing": marketing_spend / months_observed,
+        "monthly_revenue": float(df[df["amount"] > 0]["amount"].sum()) / months_observed,
+        "category_monthly": {
+            e["category"]: e["amount"] / months_observed for e in current["expenses"]
+        },
+    }
+
+
+def _burn_slopes(base: dict[str, Any], params: dict[str, float]) -> dict[str, float]:
+    """d(new_burn)/d(lever) at *params*."""
+    return {
+        "new_hires": params["avg_salary"],
+        "avg_salary": params["new_hires"],
+        "marketing_change_pct": base["monthly_marketing"] / 100,
+        "revenue_growth_pct": -base["monthly_revenue"] / 100,
+        "additional_monthly_cost": 1.0,
+        "additional_monthly_revenue": -1.0,
+    }
+
+
+def project_scenario(
+    base: dict[str, Any],
+    cash_balance: float,
+    params: dict[str, float],
+    headcount: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """
+    Apply scenario levers to *base* and return the /scenario response.
+
+    With a *headcount* plan, the response also carries the monthly
+    ``headcount`` path: steady-state scenario burn plus planned payroll,
+    the resulting cash balance and the runway along that path.
+    """
+    current_burn = base["burn"]
+    current_runway = months_of_runway(cash_balance, current_burn)
+
+    hire_cost = params["new_hires"] * params["avg_salary"]
+    marketing_delta = base["monthly_marketing"] * (params["marketing_change_pct"] / 100)
+    revenue_delta = base["monthly_revenue"] * (params["revenue_growth_pct"] / 100)
+
+    # New burn = old burn + new hiring + marketing change - revenue growth + extra costs - extra revenue
+    new_burn = (
+        current_burn + hire_cost + marketing_delta - revenue_delta
+        + params["additional_monthly_cost"] - params["additional_monthly_revenue"]
+    )
+    new_runway = months_of_runway(cash_balance, new_burn)
+
+    result = {
+        "current_burn": round(current_burn, 2),
+        "new_burn": round(new_burn, 2),
+        "current_runway": current_runway,
+        "new_runway": new_runway,
+        "burn_change": round(new_burn - current_burn, 2),
+        "runway_change": round((new_runway or 0) - (current_runway or 0), 2) if new_runway and current_runway else None,
+        "breakdown": {
+            "hiring_cost": round(hire_cost, 2),
+            "marketing_delta": round(marketing_delta, 2),
+            "revenue_delta": round(revenue_delta, 2),
+            "additional_cost": round(params["additional_monthly_cost"], 2),
+            "additional_revenue": round(params["additional_monthly_revenue"], 2),
+        },
+    }
+
+    if headcount is not None:
+        payroll = payroll_path(headcount, headcount["horizon"])
+        burn_path = new_burn + payroll
+        result["headcount"] = {
+            "months": len(payroll),
+            "payroll": np.round(payroll, 2).tolist(),
+            "burn": np.round(burn_path, 2).tolist(),
+            "cash": np.round(cash_balance - np.cumsum(burn_path), 2).tolist(),
+            "peak_burn": round(float(burn_path.max()), 2) if len(burn_path) else round(new_burn, 2),
+            "runway_months": path_runway(cash_balance, burn_path),
+        }
+
+    return result
+
+
+def _scenario_burn(base: dict[str, Any], params: dict[str, float]) -> float:
+    return (
+        base["burn"]
+        + params["new_hires"] * params["avg_salary"]
+        + base["monthly_marketing"] * params["marketing_change_pct"] / 100
+        - base["monthly_revenue"] * params["revenue_growth_pct"] / 100
+        + params["additional_monthly_cost"]
+        - params["additional_monthly_revenue"]
+    )
+
+
+def compute_sensitivity(
+    base: dict[str, Any],
+    cash_balance: float,
+    params: dict[str, float],
+    bounds: Optional[list[dict[str, Any]]] = None,
+) -> dict[str, Any]:
+    """
+    Analytic runway gradients and tornado ranges around a scenario point.
+
+    Parameters
+    ----------
+    base : dict          Output of ``scenario_baseline``.
+    cash_balance : float
+    params : dict        Scenario levers (see SCENARIO_LEVERS).
+    bounds : list of dict, optional
+        ``{"lever", "low", "high"}`` with absolute lever values; category
+        levers are named ``category:<name>`` and take % spend changes.
+        Defaults to DEFAULT_TORNADO_OFFSETS around *params* plus
+        DEFAULT_CATEGORY_OFFSETS for every category.
+
+    Raises
+    ------
+    ValueError  on an unknown lever or category.
+    """
+    burn = _scenario_burn(base, params)
+    slopes = _burn_slopes(base, params)
+    categories = base["category_monthly"]
+
+    # ── Gradients: d runway / d x = -cash / burn² · d burn / d x ─────
+    if burn > 0:
+        d_runway_d_burn = -cash_balance / burn ** 2
+        gradients = {k: round(d_runway_d_burn * v, 6) for k, v in slopes.items()}
+        category_gradients = [
+            {
+                "category": cat,
+                "monthly_spend": round(spend, 2),
+                "per_dollar": round(d_runway_d_burn, 8),
+                "per_pct": round(d_runway_d_burn * spend / 100, 6),
+            }
+            for cat, spend in categories.items()
+        ]
+    else:
+        d_runway_d_burn = None
+        gradients = {k: None for k in slopes}
+        category_gradients = [
+            {"category": cat, "monthly_spend": round(spend, 2), "per_dollar": None, "per_pct": None}
+            for cat, spend in categories.items()
+        ]
+
+    # ── Tornado ranges (all levers evaluated at once) ────────────────
+    if bounds is None:
+        bounds = [
+            {"lever": k, "low": max(params[k] + lo, 0) if k == "new_hires" else params[k] + lo,
+             "high": params[k] + hi}
+            for k, (lo, hi) in DEFAULT_TORNADO_OFFSETS.items()
+        ] + [
+            {"lever": f"{CATEGORY_LEVER_PREFIX}{cat}", "low": DEFAULT_CATEGORY_OFFSETS[0],
+             "high": DEFAULT_CATEGORY_OFFSETS[1]}
+            for cat in categories
+        ]
+
+    levers, slope, x0, lows, highs = [], [], [], [], []
+    for b in bounds:
+        lever = b["lever"]
+        if lever.startswith(CATEGORY_LEVER_PREFIX):
+            cat = lever[len(CATEGORY_LEVER_PREFIX):]
+            if cat not in categories:
+                raise ValueError(f"Unknown category lever: {cat}")
+            slope.append(categories[cat] / 100)
+            x0.append(0.0)
+        elif lever in slopes:
+            slope.append(slopes[lever])
+            x0.append(params[lever])
+        else:
+            raise ValueError(f"Unknown lever: {lever}")
+        levers.append(lever)
+        lows.append(b["low"])
+        highs.append(b["high"])
+
+    slope_arr = np.asarray(slope, dtype=float)
+    x0_arr = np.asarray(x0, dtype=float)
+    burn_low = burn + slope_arr * (np.asarray(lows, dtype=float) - x0_arr)
+    burn_high = burn + slope_arr * (np.asarray(highs, dtype=float) - x0_arr)
+    with np.errstate(divide="ignore"):
+        rw_low = np.where(burn_low > 0, cash_balance / burn_low, np.inf)
+        rw_high = np.where(burn_high > 0, cash_balance / burn_high, np.inf)
+    swing = np.abs(rw_high - rw_low)
+    swing = np.where(np.isnan(swing), 0.0, swing)  # inf - inf: both ends uncapped
+
+    def _out(v: float) -> Optional[float]:
+        return round(float(v), 2) if np.isfinite(v) else None
+
+    tornado = [
+        {
+            "lever": levers[i],
+            "low": lows[i],
+            "high": highs[i],
+            "runway_low": _out(rw_low[i]),
+            "runway_high": _out(rw_high[i]),
+            "swing": _out(swing[i]),
+        }
+        for i in np.argsort(-swing, kind="stable")
+    ]
+
+    return {
+        "cash": cash_balance,
+        "burn": round(burn, 2),
+        "runway": months_of_runway(cash_balance, burn),
+        "d_runway_d_burn": round(d_runway_d_burn, 8) if d_runway_d_burn is not None else None,
+        "gradients": gradients,
+        "category_gradients": category_gradients,
+        "tornado": tornado,
+    }
+
+
+# ── Goal seek ────────────────────────────────────────────────────────
+DEFAULT_GOAL_BOUNDS: dict[str, tuple[float, float]] = {
+    "new_hires": (0, 1_000),
+    "avg_salary": (0, 1_000_000),
+    "marketing_change_pct": (-100, 1_000),
+    "revenue_growth_pct": (-100, 1_000),
+    "additional_monthly_cost": (0, 1e9),
+    "additional_monthly_revenue": (0, 1e9),
+}
+_BISECT_ITERATIONS = 100
+_BURN_TOLERANCE = 1e-6
+
+
+def _solve_continuous(
+    base: dict[str, Any],
+    params: dict[str, float],
+    free: list[str],
+    target_burn: float,
+    bounds: dict[str, tuple[float, float]],
+) -> tuple[dict[str, float], str, bool]:
+    """Solve burn(params) == target_burn over *free*, ignoring integrality."""
+    params = dict(params)
+
+    if len(free) == 1:
+        var = free[0]
+        slope = _burn_slopes(base, params)[var]
+        lo, hi = bounds[var]
+        if slope == 0:
+            return params, "closed_form", abs(_scenario_burn(base, params) - target_burn) < _BURN_TOLERANCE
+        x = params[var] + (target_burn - _scenario_burn(base, params)) / slope
+        params[var] = float(min(max(x, lo), hi))
+        return params, "closed_form", lo <= x <= hi
+
+    # Several free levers: start from the current values and move every
+    # lever together toward the bound on the side that shifts burn
+    # toward the target, bisecting on the position along that segment.
+    start = {v: float(min(max(params[v], bounds[v][0]), bounds[v][1])) for v in free}
+    params.update(start)
+    g_start = _scenario_burn(base, params) - target_burn
+    if abs(g_start) < _BURN_TOLERANCE:
+        return params, "bisection", True
+
+    slopes = _burn_slopes(base, params)
+    ends = {
+        v: start[v] if slopes[v] == 0
+        else bounds[v][0] if (slopes[v] > 0) == (g_start > 0)
+        else bounds[v][1]
+        for v in free
+    }
+
+    def at(t: float) -> dict[str, float]:
+        return {**params, **{v: start[v] + t * (ends[v] - start[v]) for v in free}}
+
+    g_end = _scenario_burn(base, at(1.0)) - target_burn
+    if (g_end < 0) == (g_start < 0) and abs(g_end) >= _BURN_TOLERANCE:
+        return at(1.0), "bisection", False
+
+    a, b = 0.0, 1.0
+    for _ in range(_BISECT_ITERATIONS):
+        mid = (a + b) / 2
+        g_mid = _scenario_burn(base, at(mid)) - target_burn
+        if abs(g_mid) < _BURN_TOLERANCE:
+            a = b = mid
+            break
+        if (g_mid < 0) == (g_start < 0):
+            a = mid
+        else:
+            b = mid
+    return at((a + b) / 2), "bisection", True
+
+
+def goal_seek(
+    base: dict[str, Any],
+    cash_balance: float,
+    params: dict[str, float],
+    free: list[str],
+    target_runway: Optional[float] = None,
+    target_burn: Optional[float] = None,
+    bounds: Optional[dict[str, tuple[float, float]]] = None,
+) -> dict[str, Any]:
+    """
+    Find values of the *free* scenario levers that hit a runway or burn
+    target, holding the other levers at *params*.
+
+    One free lever is solved in closed form (burn is linear in each
+    lever).  Several start from their current values in *params* and
+    move together, each toward the bound on its side that shifts burn
+    toward the target, solved by bisection along that path.  ``new_hires`` is then rounded to a whole number (floor
+    when hiring raises burn) and any remaining free levers are re-solved
+    around it.
+
+    ``feasible`` reports whether the target is met (runway at least, burn
+    at most the target); ``exact`` whether it is hit within the bounds.
+
+    Raises
+    ------
+    ValueError  on a missing/duplicate target, unknown lever or bad bounds.
+    """
+    if (target_runway is None) == (target_burn is None):
+        raise ValueError("Provide exactly one of target_runway or target_burn.")
+    if not free:
+        raise ValueError("At least one free variable is required.")
+    unknown = [v for v in free if v not in SCENARIO_LEVERS]
+    if unknown:
+        raise ValueError(f"Unknown free variables: {', '.join(unknown)}")
+
+    merged = {**DEFAULT_GOAL_BOUNDS, **(bounds or {})}
+    for v in free:
+        if merged[v][0] > merged[v][1]:
+            raise ValueError(f"Bounds for {v} are inverted.")
+
+    goal_burn = cash_balance / target_runway if target_runway is not None else target_burn
+
+    solution, method, feasible = _solve_continuous(base, params, list(free), goal_burn, merged)
+
+    if "new_hires" in free:
+        raises_burn = _burn_slopes(base, solution)["new_hires"] > 0
+        lo, hi = merged["new_hires"]
+        safe = float(np.floor(solution["new_hires"] + 1e-9) if raises_burn
+                     else np.ceil(solution["new_hires"] - 1e-9))
+        other = safe + 1 if raises_burn else safe - 1
+        rest = [v for v in free if v != "new_hires"]
+        method = "integer" if not rest else f"{method}+integer"
+
+        # With other free levers, the other whole number may also work
+        # once they are re-solved around it; prefer an exact hit.
+        candidates = [safe, other] if rest else [safe]
+        best = None
+        for hires in candidates:
+            trial = {**solution, "new_hires": min(max(hires, float(np.ceil(lo))), float(np.floor(hi)))}
+            trial_ok = feasible
+            if rest:
+                trial, _, trial_ok = _solve_continuous(base, trial, rest, goal_burn, merged)
+            if best is None or (trial_ok and not best[1]):
+                best = (trial, trial_ok)
+        solution, feasible = best
+
+    achieved_burn = _scenario_burn(base, solution)
+    achieved_runway = months_of_runway(cash_balance, achieved_burn)
+    if target_runway is not None:
+        meets = achieved_runway is None or achieved_runway >= target_runway - 0.005
+    else:
+        meets = achieved_burn <= target_burn + 0.005
+
+    return {
+        "target_runway": target_runway,
+        "target_burn": round(goal_burn, 2),
+        "free_variables": list(free),
+        "method": method,
+        "feasible": bool(meets),
+        "exact": abs(achieved_burn - goal_burn) < 0.005,
+        "solution": {v: round(solution[v], 4) for v in free},
+        "scenario": project_scenario(base, cash_balance, solution),
+    }
@@ -0,0 +1,172 @@
+"""
+startup.py – Deferred imports, background warm-up and startup timing.
+
+The API process only needs FastAPI to answer ``/health``; pandas, numpy
+and the analytics modules built on them account for most of the import
+time.  ``deferred`` stands in for a module function and imports it on
+first call, and ``start_warmup`` loads those modules (plus snapshots of
+the most recent datasets) on a background thread once the server is up,
+so the first real request rarely pays the import cost either.
+
+Modes (``STARTUP_MODE``):
+
+* ``lazy`` (default): serve immediately, warm up in the background.
+* ``eager``: finish the warm-up before serving (previous behaviour).
+"""
+
+import importlib
+import os
+import pickle
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+_T0 = time.perf_counter()
+
+STARTUP_MODE = os.getenv("STARTUP_MODE", "lazy")
+
+# Analytics modules pre-imported by the warm-up, heaviest first
+WARM_MODULES = (
+    "pandas",
+    "numpy",
+    "utils",
+    "financial_engine",
+    "optimizer",
+    "anomaly_detector",
+    "baseline",
+    "scenario",
+    "headcount",
+    "timeseries",
+    "ledger_index",
+    "recurring",
+    "daily_cash",
+    "portfolio",
+    "fx",
+    "ai_layer",
+)
+
+# Uploaded ledgers are pickled here when set, and the most recent
+# WARM_DATASETS are reloaded on start-up
+SNAPSHOT_DIR: Optional[str] = os.getenv("SNAPSHOT_DIR") or None
+WARM_DATASETS = int(os.getenv("WARM_DATASETS", "3"))
+
+_TIMINGS: dict[str, float] = {}
+_WARM_STATE = {"status": "pending", "error": None}
+
+
+def load_env() -> None:
+    """Load ``.env`` into the environment if python-dotenv is installed."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return  # python-dotenv is optional
+    load_dotenv()
+
+
+def mark(event: str) -> None:
+    """Record *event* as milliseconds since this module was imported."""
+    _TIMINGS.setdefault(event, round((time.perf_counter() - _T0) * 1000, 1))
+
+
+def deferred(module: str, *names: str) -> Any:
+    """
+    Callable stand-ins for ``module.name`` that import *module* on first use.
+
+    Returns one callable for a single name, otherwise a tuple in order.
+    """
+
+    def stand_in(name: str) -> Callable[..., Any]:
+        target: Optional[Callable[..., Any]] = None
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            nonlocal target
+            if target is None:
+                target = getattr(importlib.import_module(module), name)
+            return target(*args, **kwargs)
+
+        call.__name__ = call.__qualname__ = name
+        call.__doc__ = f"Deferred ``{module}.{name}``."
+        return call
+
+    stubs = tuple(stand_in(n) for n in names)
+    return stubs[0] if len(stubs) == 1 else stubs
+
+
+# ── Dataset snapshots ────────────────────────────────────────────────
+def _snapshot_path(dataset_id: str) -> Path:
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", dataset_id)
+    return Path(SNAPSHOT_DIR) / f"{safe}.pkl"
+
+
+def save_snapshot(dataset_id: str, df: Any, summary: dict[str, Any]) -> None:
+    """Persist a normalised ledger for warm restarts (no-op without SNAPSHOT_DIR)."""
+    if not SNAPSHOT_DIR:
+        return
+    path = _snapshot_path(dataset_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as fh:
+        pickle.dump({"dataset_id": dataset_id, "df": df, "summary": summary}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(path)
+
+
+def delete_snapshot(dataset_id: str) -> None:
+    """Remove a dataset's snapshot, if any (no-op without SNAPSHOT_DIR)."""
+    if SNAPSHOT_DIR:
+        _snapshot_path(dataset_id).unlink(missing_ok=True)
+
+
+def recent_snapshots(limit: int = WARM_DATASETS) -> list[dict[str, Any]]:
+    """The *limit* most recently written snapshots, oldest first."""
+    if not SNAPSHOT_DIR or not Path(SNAPSHOT_DIR).is_dir():
+        return []
+    paths = sorted(Path(SNAPSHOT_DIR).glob("*.pkl"), key=lambda p: p.stat().st_mtime)[-limit:] if limit else []
+    snapshots = []
+    for path in paths:
+        with open(path, "rb") as fh:
+            snapshots.append(pickle.load(fh))
+    return snapshots
+
+
+# ── Warm-up ──────────────────────────────────────────────────────────
+def _warm(restore: Optional[Callable[[list[dict[str, Any]]], None]]) -> None:
+    try:
+        for module in WARM_MODULES:
+            importlib.import_module(module)
+        mark("modules_loaded")
+        if restore is not None:
+            snapshots = recent_snapshots()
+            if snapshots:
+                restore(snapshots)
+            mark("datasets_warmed")
+        _WARM_STATE["status"] = "ready"
+    except Exception as exc:  # warm-up is best effort; requests still import on demand
+        _WARM_STATE.update(status="failed", error=str(exc))
+    mark("warm")
+
+
+def start_warmup(restore: Optional[Callable[[list[dict[str, Any]]], None]] = None) -> None:
+    """
+    Import the analytics stack and hand recent snapshots to *restore*.
+
+    Blocks in ``eager`` mode; runs on a daemon thread in ``lazy`` mode.
+    """
+    if STARTUP_MODE == "eager":
+        _warm(restore)
+    else:
+        threading.Thread(target=_warm, args=(restore,), name="warmup", daemon=True).start()
+
+
+def startup_report() -> dict[str, Any]:
+    """Mode, warm-up state, timings (ms) and which heavy modules are loaded."""
+    return {
+        "mode": STARTUP_MODE,
+        "warmup": _WARM_STATE["status"],
+        "warmup_error": _WARM_STATE["error"],
+        "timings_ms": dict(_TIMINGS),
+        "uptime_ms": round((time.perf_counter() - _T0) * 1000, 1),
+        "loaded": {m: m in sys.modules for m in ("pandas", "numpy", "pyarrow", "requests")},
+    }
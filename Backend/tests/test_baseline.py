@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from baseline import fit_baseline, latest_z_scores
+
+THRESHOLD = 1.5
+
+
+def _fit(end: str, months: int, columns: dict) -> tuple[dict, np.ndarray]:
+    periods = pd.period_range(end=end, periods=months, freq="M")
+    moy = periods.month.to_numpy()
+    expense = np.stack([build(moy) for build in columns.values()], axis=1)
+    baseline = fit_baseline(
+        [str(p) for p in periods], list(columns), expense, np.zeros_like(expense), np.ones(months, bool)
+    )
+    return baseline, latest_z_scores(baseline)
+
+
+@pytest.mark.parametrize("months", [36, 48, 60])
+@pytest.mark.parametrize("end", ["2024-03", "2024-06", "2024-12"])
+def test_annual_renewal_and_december_bonus_are_expected(months, end):
+    baseline, z = _fit(end, months, {
+        "SaaS": lambda m: np.where(m == 3, 24_000.0, 0.0),
+        "Payroll": lambda m: 30_000.0 + np.where(m == 12, 15_000.0, 0.0),
+    })
+    assert baseline["method"] == "seasonal"
+    assert np.all(np.abs(z) < THRESHOLD)
+
+
+@pytest.mark.parametrize("months", [36, 60])
+def test_seasonal_spike_above_the_usual_peak_is_flagged(months):
+    def renewal(m):
+        spend = np.where(m == 3, 24_000.0, 0.0)
+        spend[np.flatnonzero(m == 3)[-1]] = 30_000.0
+        return spend
+
+    _, z = _fit("2024-12", months, {"SaaS": renewal})
+    assert z[0] > THRESHOLD
+
+
+def test_flat_noise_rarely_flags():
+    rng = np.random.default_rng(0)
+    rates = []
+    for _ in range(30):
+        _, z = _fit("2024-12", 48, {str(i): lambda m: rng.normal(1_000, 100, len(m)) for i in range(8)})
+        rates.append(np.mean(np.abs(z) > THRESHOLD))
+    assert np.mean(rates) < 0.15
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from classifier import CategoryClassifier
+
+
+def test_regex_rules_compile_on_their_own():
+    clf = CategoryClassifier([
+        {"match": "exact", "pattern": "rent", "category": "Rent"},
+        {"match": "regex", "pattern": "(?i)aws", "category": "Cloud"},
+        {"match": "regex", "pattern": r"(ab)\1", "category": "Echo"},
+        {"match": "keyword", "pattern": "payroll", "category": "Payroll"},
+    ])
+    canon, rule_ids = clf.classify(pd.Series(["Rent", "AWS bill", "x abab", "June payroll", "misc"]))
+    assert canon.tolist() == ["Rent", "Cloud", "Echo", "Payroll", "Misc"]
+    assert rule_ids[-1] == "fallback:title"
+
+
+def test_rule_order_is_priority_across_regex_and_literals():
+    clf = CategoryClassifier([
+        {"match": "regex", "pattern": "^aws", "category": "Cloud"},
+        {"match": "prefix", "pattern": "aws", "category": "Other Cloud"},
+        {"match": "prefix", "pattern": "gcp", "category": "GCP"},
+    ])
+    assert clf.classify_one("AWS")[0] == "Cloud"
+    assert clf.classify_one("gcp credits")[0] == "GCP"
+
+
+def test_invalid_regex_is_a_value_error():
+    with pytest.raises(ValueError, match="invalid regex"):
+        CategoryClassifier([{"match": "regex", "pattern": "(", "category": "X"}])
@@ -0,0 +1,57 @@
+"""Regression checks for upload-time data-quality handling of blank cells."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data_quality import DataQualityError  # noqa: E402
+from utils import parse_and_validate_csv  # noqa: E402
+
+
+def _checks(report: dict) -> dict[str, int]:
+    return {i["check"]: i["count"] for i in report["issues"]}
+
+
+@pytest.mark.parametrize(
+    "csv, check",
+    [
+        (b"date,amount,category\n2025-01-05,-100,Rent\n2025-01-06,,Rent\n", "missing_amount"),
+        (b"date,amount,category\n,-100,Rent\n2025-01-06,-5,Rent\n", "missing_date"),
+    ],
+)
+def test_missing_cell_is_reported_not_crashed(csv, check):
+    with pytest.raises(DataQualityError) as exc:
+        parse_and_validate_csv(csv)
+    assert _checks(exc.value.report) == {check: 1}
+
+    df, summary = parse_and_validate_csv(csv, drop_invalid=True)
+    assert len(df) == 1
+    assert summary["quality"]["rows_dropped"] == 1
+
+
+def test_all_blank_category_column():
+    df, summary = parse_and_validate_csv(b"date,amount,category\n2025-01-05,-100,\n2025-01-06,-5,\n")
+    assert len(df) == 2
+    assert summary["quality"]["errors"] == 0
+
+
+def test_timezone_aware_dates_are_normalised():
+    csv = (
+        b"date,amount,category\n"
+        b"2025-01-05T00:00:00Z,-100,Rent\n"
+        b"2025-02-05T10:00:00+02:00,-100,Rent\n"
+        b"2099-01-01T00:00:00Z,-100,Rent\n"
+    )
+    df, summary = parse_and_validate_csv(csv)
+    assert df["date"].dt.tz is None
+    assert df["month"].tolist() == ["2025-01", "2025-02", "2099-01"]
+    assert {i["check"] for i in summary["quality"]["issues"]} == {"future_date", "month_gap"}
+    assert summary["quality"]["errors"] == 0
+
+
+def test_header_only_file_is_rejected():
+    with pytest.raises(DataQualityError, match="no data rows"):
+        parse_and_validate_csv(b"date,amount,category\n")
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from headcount import build_headcount_plan, with_planned_payroll
+
+
+@pytest.mark.parametrize("start_month", [12, 20])
+def test_open_ended_role_past_the_horizon_contributes_nothing(start_month):
+    plan = build_headcount_plan(
+        [
+            {"title": "Engineer", "start_month": 0, "monthly_salary": 10_000, "burden_rate": 0},
+            {"title": "Later hire", "start_month": start_month, "monthly_salary": 8_000},
+        ],
+        horizon=12,
+    )
+    assert plan["payroll"].tolist() == [10_000.0] * 12
+    assert plan["roles"][1]["active_months"] == 0
+    assert plan["roles"][1]["end_month"] is None
+
+
+def test_explicit_end_before_start_is_rejected():
+    with pytest.raises(ValueError, match="ends before it starts"):
+        build_headcount_plan([{"title": "Contractor", "start_month": 5, "end_month": 5, "monthly_salary": 1}])
+
+
+def test_planned_payroll_is_added_to_metrics_burn():
+    plan = build_headcount_plan(
+        [{"title": "Engineer", "start_month": 6, "monthly_salary": 10_000, "burden_rate": 0}],
+        horizon=12,
+    )
+    metrics = {"cash": 120_000.0, "burn": 5_000.0, "runway": 24.0, "expenses": []}
+    adjusted = with_planned_payroll(metrics, plan)
+    assert adjusted["burn"] == 10_000.0
+    assert adjusted["runway"] == 12.0
+    assert adjusted["planned_payroll"] == 5_000.0
+    assert with_planned_payroll(metrics, None) is metrics
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ledger_index import LedgerIndex
+
+
+@pytest.fixture
+def index():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 120, 500), unit="D"),
+        "amount": rng.choice([-500.0, -120.0, -40.0, 90.0, 300.0], 500),
+        "category": rng.choice(["Payroll", "SaaS", "Revenue", "Cloud"], 500),
+        "notes": rng.choice(["aws", "stripe", None], 500),
+    })
+    return df, LedgerIndex(df, version=1)
+
+
+def _all_rows(index, **query):
+    rows, cursor = [], None
+    while True:
+        page = index.query(limit=37, cursor=cursor, **query)
+        rows += [t["row"] for t in page["transactions"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return rows, page["total"]
+
+
+@pytest.mark.parametrize("sort_by", ["date", "amount", "category"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_the_sorted_result_exactly_once(index, sort_by, descending):
+    df, idx = index
+    rows, total = _all_rows(idx, sort_by=sort_by, descending=descending, min_amount=-200)
+
+    expected = df[df["amount"] >= -200].sort_values("date", kind="stable")
+    if sort_by != "date":
+        expected = expected.sort_values(sort_by, kind="stable")
+    expected = expected.index.tolist()
+    assert rows == (expected[::-1] if descending else expected)
+    assert total == len(expected)
+
+
+def test_cursor_is_bound_to_its_query(index):
+    _, idx = index
+    cursor = idx.query(sort_by="amount", limit=10)["next_cursor"]
+    idx.query(sort_by="amount", limit=10, cursor=cursor)
+    with pytest.raises(ValueError, match="different query"):
+        idx.query(sort_by="amount", limit=10, cursor=cursor, categories=["SaaS"])
+    with pytest.raises(ValueError, match="different query"):
+        idx.query(sort_by="date", limit=10, cursor=cursor)
+    with pytest.raises(ValueError, match="previous upload"):
+        LedgerIndex(index[0], version=2).query(sort_by="amount", cursor=cursor)
+
+
+def test_notes_search_matches_a_scan(index):
+    df, idx = index
+    page = idx.query(search="AW", limit=1000)
+    expected = df.index[df["notes"].fillna("").str.lower().str.contains("aw")]
+    assert sorted(t["row"] for t in page["transactions"]) == sorted(expected)
+    assert {t["notes"] for t in page["transactions"]} == {"aws"}
+    assert any(t["notes"] is None for t in idx.query(limit=1000)["transactions"])
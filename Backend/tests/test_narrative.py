@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from narrative import render_board_report
+
+
+METRICS = {"cash": 100_000.0, "burn": 10_000.0, "runway": 10.0, "expenses": []}
+
+
+def test_saas_cut_flags_vendor_risk():
+    optimization = {
+        "current_runway": 10.0,
+        "new_runway": 11.0,
+        "monthly_burn_before": 10_000.0,
+        "monthly_burn_after": 9_000.0,
+        "plan": [{"action": "Cut SaaS by 10%", "category": "SaaS", "monthly_savings_est": 1_000.0}],
+    }
+    report = render_board_report(METRICS, optimization)
+    assert "Vendor renegotiation depends on counterparties" in report
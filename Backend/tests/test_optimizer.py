@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from headcount import build_headcount_plan
+from optimizer import HIRE_DELAY_MONTHS, _hire_delays
+
+
+def test_hire_delay_saves_only_the_delayed_months():
+    plan = build_headcount_plan(
+        [
+            {"title": "Engineer", "start_month": 0, "monthly_salary": 12_000, "burden_rate": 0},
+            {"title": "Designer", "start_month": 10, "monthly_salary": 9_000, "burden_rate": 0},
+        ],
+        horizon=12,
+    )
+    actions = {a["role"]: a for a in _hire_delays(plan)}
+    # A full-horizon role loses HIRE_DELAY_MONTHS of its twelve months
+    assert actions["Engineer"]["monthly_savings_est"] == 12_000 * HIRE_DELAY_MONTHS / 12
+    # A role with fewer active months than the delay loses only those
+    assert actions["Designer"]["monthly_savings_est"] == 9_000 * 2 / 12
+    assert actions["Engineer"]["monthly_savings_est"] < plan["avg_monthly_payroll"]
@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from recurring import detect_recurring
+
+
+def _ledger(rows):
+    df = pd.DataFrame(rows, columns=["date", "amount", "category", "notes"])
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+def test_same_vendor_at_two_price_points_is_two_streams():
+    rows = []
+    for month in range(1, 7):
+        rows.append((f"2025-{month:02d}-05", -300.0, "SaaS", "GitHub"))
+        rows.append((f"2025-{month:02d}-21", -4_000.0, "SaaS", "GitHub"))
+    result = detect_recurring(_ledger(rows))
+
+    assert sorted(s["vendor"] for s in result["subscriptions"]) == ["github (~$300)", "github (~$4,000)"]
+    assert {s["cadence"] for s in result["subscriptions"]} == {"monthly"}
+    assert 4_250 < result["total_monthly_recurring"] < 4_350
+
+
+def test_gradual_price_rise_stays_one_stream():
+    rows = [(f"2025-{m:02d}-03", -100.0 * 1.1 ** m, "Cloud", "AWS bill") for m in range(1, 10)]
+    result = detect_recurring(_ledger(rows))
+    assert [s["vendor"] for s in result["subscriptions"]] == ["aws"]
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scenario import goal_seek
+
+BASE = {"burn": 43_000.0, "monthly_marketing": 3_800.0, "monthly_revenue": 12_750.0}
+PARAMS = {
+    "new_hires": 2,
+    "avg_salary": 8_000,
+    "marketing_change_pct": 10,
+    "revenue_growth_pct": 0,
+    "additional_monthly_cost": 0,
+    "additional_monthly_revenue": 0,
+}
+
+
+def test_multi_lever_goal_seek_moves_from_current_params_toward_target():
+    # Current burn is above the 9-month target: marketing must be cut
+    # and revenue grown, never the other way round.
+    result = goal_seek(BASE, 400_000, PARAMS, ["marketing_change_pct", "revenue_growth_pct"], target_runway=9)
+    assert result["exact"]
+    assert result["solution"]["marketing_change_pct"] < PARAMS["marketing_change_pct"]
+    assert result["solution"]["revenue_growth_pct"] > 0
+
+
+def test_multi_lever_goal_seek_keeps_hires_near_current_plan():
+    result = goal_seek(BASE, 400_000, PARAMS, ["new_hires", "revenue_growth_pct"], target_runway=9)
+    assert result["exact"]
+    assert result["solution"]["new_hires"] <= PARAMS["new_hires"]
+    assert result["solution"]["revenue_growth_pct"] > 0
+
+
+def test_multi_lever_goal_seek_reports_infeasible_target():
+    bounds = {"marketing_change_pct": (0, 20), "revenue_growth_pct": (0, 5)}
+    result = goal_seek(BASE, 400_000, PARAMS, ["marketing_change_pct", "revenue_growth_pct"],
+                       target_runway=12, bounds=bounds)
+    assert not result["feasible"]
+    assert result["solution"] == {"marketing_change_pct": 0, "revenue_growth_pct": 5}
@@ -0,0 +1,179 @@
+"""
+timeseries.py – Month × category matrices and derived trend metrics.
+
+The full-resolution matrices are views of the dataset's cached
+aggregates; they and the rolling averages are built once per dataset
+(``build_timeseries_frames``), and every response, downsampled or not,
+is derived from them.  Requests are keyed by bucket width rather
+than ``max_points``, since every ``max_points`` yielding the same width
+yields the same payload.
+"""
+
+import math
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+ROLLING_WINDOWS: tuple[int, ...] = (3, 6, 12)
+
+
+def build_month_category_matrix(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Pivot the ledger into dense month × category expense and revenue matrices.
+
+    Months with no transactions are filled with zeros so that rolling
+    windows and growth rates are calendar-correct.
+
+    Returns
+    -------
+    expense, revenue : pd.DataFrame
+        Indexed by month (YYYY-MM), one column per category.  Expenses
+        are positive magnitudes.
+    """
+    amounts = df["amount"].to_numpy(dtype=float)
+    frame = pd.DataFrame(
+        {
+            "month": df["month"].to_numpy(),
+            "category": df["category"].to_numpy(),
+            "expense": np.where(amounts < 0, -amounts, 0.0),
+            "revenue": np.where(amounts > 0, amounts, 0.0),
+        }
+    )
+    grouped = frame.groupby(["month", "category"], sort=True)[["expense", "revenue"]].sum()
+
+    periods = pd.PeriodIndex(grouped.index.get_level_values("month").unique(), freq="M")
+    full_index = pd.period_range(periods.min(), periods.max(), freq="M").astype(str)
+
+    expense = grouped["expense"].unstack(fill_value=0.0).reindex(full_index, fill_value=0.0)
+    revenue = grouped["revenue"].unstack(fill_value=0.0).reindex(full_index, fill_value=0.0)
+    return expense, revenue
+
+
+def build_timeseries_frames(aggregates: dict[str, Any]) -> dict[str, Any]:
+    """
+    Full-resolution inputs for ``compute_timeseries``, labelled views of
+    the matrices in *aggregates* (``portfolio.build_aggregates``).
+
+    Returns
+    -------
+    dict with ``expense`` and ``revenue`` (months × all categories) and
+    ``rolling`` ({window: rolling mean of expense}).
+    """
+    index = pd.Index(aggregates["months"])
+    columns = pd.Index(aggregates["categories"])
+    expense = pd.DataFrame(aggregates["expense"], index=index, columns=columns)
+    revenue = pd.DataFrame(aggregates["revenue"], index=index, columns=columns)
+    return {
+        "expense": expense,
+        "revenue": revenue,
+        "rolling": {w: expense.rolling(w, min_periods=1).mean() for w in ROLLING_WINDOWS},
+    }
+
+
+def timeseries_bucket(frames: dict[str, Any], max_points: Optional[int]) -> int:
+    """Months per point so at most *max_points* remain (1: no downsampling)."""
+    n = len(frames["expense"].index)
+    return math.ceil(n / max_points) if max_points and n > max_points else 1
+
+
+def _downsample(
+    expense: pd.DataFrame,
+    revenue: pd.DataFrame,
+    rolling: dict[int, pd.DataFrame],
+    bucket: int,
+) -> tuple[pd.DataFrame, pd.DataFrame, dict[int, pd.DataFrame]]:
+    """Merge every *bucket* consecutive months into one point."""
+    n = len(expense.index)
+    keys = np.arange(n) // bucket
+    labels = expense.index[::bucket]
+
+    expense = expense.groupby(keys).sum().set_axis(labels)
+    revenue = revenue.groupby(keys).sum().set_axis(labels)
+    # Rolling averages are already smoothed: report the value at bucket end.
+    rolling = {w: r.groupby(keys).last().set_axis(labels) for w, r in rolling.items()}
+    return expense, revenue, rolling
+
+
+def _columns(frame: pd.DataFrame) -> dict[str, list[Optional[float]]]:
+    """Serialise a month × category frame column-wise, NaN/inf → None."""
+    values = frame.to_numpy(dtype=float).round(2)
+    values = np.where(np.isfinite(values), values, np.nan)
+    return {
+        str(cat): [None if np.isnan(v) else float(v) for v in values[:, i]]
+        for i, cat in enumerate(frame.columns)
+    }
+
+
+def compute_timeseries(frames: dict[str, Any], bucket_months: int = 1) -> dict[str, Any]:
+    """
+    Compute per-category monthly series and trends in one columnar payload.
+
+    Parameters
+    ----------
+    frames : dict   From ``build_timeseries_frames``.
+    bucket_months : int
+        Months merged into each point (see ``timeseries_bucket``).
+        Flows are summed per bucket; growth and share are recomputed on
+        the buckets.
+
+    Returns
+    -------
+    dict with ``months``, ``categories`` and one ``{category: [values]}``
+    mapping per metric, plus portfolio-level ``totals``.
+    """
+    expense, revenue, rolling = frames["expense"], frames["revenue"], frames["rolling"]
+    categories = expense.columns
+    if bucket_months > 1:
+        expense, revenue, rolling = _downsample(expense, revenue, rolling, bucket_months)
+
+    net_burn = expense - revenue
+    prev = expense.shift(1)
+    growth = (expense - prev) / prev.where(prev != 0) * 100
+
+    total_expense = expense.sum(axis=1)
+    share = expense.div(total_expense.where(total_expense != 0), axis=0) * 100
+
+    total_revenue = revenue.sum(axis=1)
+    total_prev = total_expense.shift(1)
+    total_growth = (total_expense - total_prev) / total_prev.where(total_prev != 0) * 100
+    totals = pd.DataFrame(
+        {
+            "expense": total_expense,
+            "revenue": total_revenue,
+            "net_burn": total_expense - total_revenue,
+            "mom_growth_pct": total_growth,
+        }
+    )
+
+    return {
+        "months": [str(m) for m in expense.index],
+        "categories": [str(c) for c in categories],
+        "bucket_months": bucket_months,
+        "expense": _columns(expense),
+        "revenue": _columns(revenue),
+        "net_burn": _columns(net_burn),
+        "mom_growth_pct": _columns(growth),
+        "share_of_spend_pct": _columns(share),
+        "rolling_avg": {
+            str(w): _columns(r) for w, r in rolling.items()
+        },
+        "totals": _columns(totals),
+    }
+
+
+def timeseries_columns(payload: dict[str, Any]) -> dict[str, list]:
+    """
+    Flatten a ``compute_timeseries`` payload into one wide table keyed by
+    month, with columns named ``<metric>:<category>``.
+    """
+    columns: dict[str, list] = {"month": payload["months"]}
+    for metric in ("expense", "revenue", "net_burn", "mom_growth_pct", "share_of_spend_pct"):
+        for cat, values in payload[metric].items():
+            columns[f"{metric}:{cat}"] = values
+    for window, series in payload["rolling_avg"].items():
+        for cat, values in series.items():
+            columns[f"rolling_avg_{window}:{cat}"] = values
+    for metric, values in payload["totals"].items():
+        columns[f"total:{metric}"] = values
+    return columns
@@ -3,10 +3,14 @@ utils.py – CSV parsing, validation, and normalization helpers.
 """
 
 from io import StringIO
-from typing import Tuple
+from typing import Optional, Tuple
 
 import pandas as pd
 
+from classifier import CategoryClassifier
+from data_quality import MAX_ISSUE_ROWS, DataQualityError, check_quality
+from fx import BASE_CURRENCY, convert_to_base
+
 # ── Category alias map ────────────────────────────────────────────────
 CATEGORY_MAP: dict[str, str] = {
     "payroll": "Payroll",
@@ -22,31 +26,45 @@ CATEGORY_MAP: dict[str, str] = {
     "office": "Rent",
 }
 
-REQUIRED_COLUMNS = {"date", "amount", "category"}
-
+DEFAULT_CLASSIFIER = CategoryClassifier.from_map(CATEGORY_MAP)
 
-def _normalize_category(raw: str | None) -> str:
-    """Map a raw category string to its canonical form."""
-    if not raw or str(raw).strip() == "":
-        return "Other"
-    cleaned = str(raw).strip().lower()
-    return CATEGORY_MAP.get(cleaned, str(raw).strip().title())
+REQUIRED_COLUMNS = {"date", "amount", "category"}
 
 
-def parse_and_validate_csv(raw_bytes: bytes) -> Tuple[pd.DataFrame, dict]:
+def parse_and_validate_csv(
+    raw_bytes: bytes,
+    fx_rates: Optional[pd.DataFrame] = None,
+    base_currency: str = BASE_CURRENCY,
+    classifier: Optional[CategoryClassifier] = None,
+    drop_invalid: bool = False,
+    max_issue_rows: int = MAX_ISSUE_ROWS,
+) -> Tuple[pd.DataFrame, dict]:
     """
     Parse uploaded CSV bytes into a normalised DataFrame.
 
+    If the CSV has a ``currency`` column, amounts are converted into
+    *base_currency* using *fx_rates* (see ``fx.parse_fx_table``).
+    Categories are canonicalised by *classifier* (default: CATEGORY_MAP
+    aliases, then title-case).
+
+    All data-quality checks run in one pass (see ``data_quality``).
+    Rows with an unparseable date or amount abort the upload unless
+    *drop_invalid* is set, in which case they are removed and reported.
+
     Returns
     -------
     df : pd.DataFrame
-        Normalised data with columns: date, amount, category, month
+        Normalised data with columns: date, amount, category,
+        category_rule, month (plus currency, amount_original when converted)
     summary : dict
-        {"rows": int, "months_detected": int, "categories_detected": int}
+        {"rows": int, "months_detected": int, "categories_detected": int,
+         "category_rules": {rule_id: rows}, "quality": report}
+        plus "currencies_detected" / "base_currency" for multi-currency files
 
     Raises
     ------
-    ValueError  with a human-readable message on bad input.
+    ValueError  with a human-readable message on bad input
+                (``DataQualityError`` with the full report for bad rows).
     """
     try:
         text = raw_bytes.decode("utf-8")
@@ -65,19 +83,33 @@ def parse_and_validate_csv(raw_bytes: bytes) -> Tuple[pd.DataFrame, dict]:
     if missing:
         raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
 
-    # ─── Date parsing ─────────────────────────────────────────────────
-    try:
-        df["date"] = pd.to_datetime(df["date"])
-    except Exception:
-        raise ValueError("Column 'date' contains unparseable values.")
-
-    # ─── Amount parsing ───────────────────────────────────────────────
-    df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
-    if df["amount"].isna().any():
-        raise ValueError("Column 'amount' contains non-numeric values.")
+    # ─── Data quality: date / amount parsing and checks ───────────────
+    df, invalid, quality = check_quality(df, max_rows=max_issue_rows)
+    quality["rows_dropped"] = int(invalid.sum()) if drop_invalid else 0
+    if invalid.any():
+        if not drop_invalid:
+            errors = [i for i in quality["issues"] if i["severity"] == "error"]
+            message = " ".join(
+                f"{i['message'][:-1]} ({'row' if i['count'] == 1 else 'rows'} "
+                f"{', '.join(map(str, i['rows']))}{', ...' if i['count'] > len(i['rows']) else ''})."
+                for i in errors
+            )
+            raise DataQualityError(message, quality)
+        df = df[~invalid].reset_index(drop=True)
+    if df.empty:
+        if invalid.any():
+            raise DataQualityError("No valid rows left after dropping invalid rows.", quality)
+        raise DataQualityError("The file has no data rows.", quality)
+
+    # ─── Currency normalisation ───────────────────────────────────────
+    if "currency" in df.columns:
+        df = convert_to_base(df, fx_rates, base_currency)
 
     # ─── Category normalisation ───────────────────────────────────────
-    df["category"] = df["category"].apply(_normalize_category)
+    classifier = classifier or DEFAULT_CLASSIFIER
+    df["category"], df["category_rule"] = classifier.classify(
+        df["category"], df["notes"] if "notes" in df.columns else None
+    )
 
     # ─── Derived: month column (YYYY-MM) ──────────────────────────────
     df["month"] = df["date"].dt.to_period("M").astype(str)
@@ -86,6 +118,13 @@ def parse_and_validate_csv(raw_bytes: bytes) -> Tuple[pd.DataFrame, dict]:
         "rows": len(df),
         "months_detected": df["month"].nunique(),
         "categories_detected": df["category"].nunique(),
+        "category_rules": {
+            str(k): int(v) for k, v in df["category_rule"].value_counts().items()
+        },
+        "quality": quality,
     }
+    if "currency" in df.columns:
+        summary["currencies_detected"] = df["currency"].nunique()
+        summary["base_currency"] = base_currency.upper()
 
     return df, summary
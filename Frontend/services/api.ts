@@ -5,10 +5,11 @@ const API = axios.create({
   timeout: 15000,
 });
 
-export const uploadCSV = async (file: File) => {
+export const uploadCSV = async (file: File, datasetId?: string, dropInvalid?: boolean) => {
   const formData = new FormData();
   formData.append("file", file);
-  const res = await API.post("/upload", formData);
+  const params = { ...(datasetId ? { dataset_id: datasetId } : {}), ...(dropInvalid ? { drop_invalid: true } : {}) };
+  const res = await API.post("/upload", formData, { params });
   return res.data;
 };
 
@@ -23,14 +24,16 @@ export const getOptimization = async (cashBalance?: number) => {
   return res.data;
 };
 
-export const getInsights = async (cashBalance?: number) => {
-  const params = cashBalance ? { cash_balance: cashBalance } : {};
+export type NarrativeEngine = "ai" | "rules" | "auto";
+
+export const getInsights = async (cashBalance?: number, engine?: NarrativeEngine) => {
+  const params = { ...(cashBalance ? { cash_balance: cashBalance } : {}), ...(engine ? { engine } : {}) };
   const res = await API.get("/insights", { params });
   return res.data;
 };
 
-export const getReport = async (months: number, cashBalance?: number) => {
-  const res = await API.post("/report", { months, cash_balance: cashBalance });
+export const getReport = async (months: number, cashBalance?: number, engine?: NarrativeEngine) => {
+  const res = await API.post("/report", { months, cash_balance: cashBalance, engine });
   return res.data;
 };
 
@@ -42,6 +45,7 @@ export const runScenario = async (scenario: {
   additional_monthly_cost?: number;
   additional_monthly_revenue?: number;
   cash_balance?: number;
+  use_headcount_plan?: boolean;
 }) => {
   const res = await API.post("/scenario", scenario);
   return res.data;
@@ -52,7 +56,141 @@ export const getAnomalies = async () => {
   return res.data;
 };
 
-export const askCFO = async (question: string, cashBalance?: number) => {
-  const res = await API.post("/ask", { question, cash_balance: cashBalance });
+export const askCFO = async (question: string, cashBalance?: number, engine?: NarrativeEngine) => {
+  const res = await API.post("/ask", { question, cash_balance: cashBalance, engine });
+  return res.data;
+};
+
+export const getTimeseries = async (maxPoints?: number) => {
+  const params = maxPoints ? { max_points: maxPoints } : {};
+  const res = await API.get("/timeseries", { params });
+  return res.data;
+};
+
+export const getTransactions = async (filters: {
+  start_date?: string;
+  end_date?: string;
+  category?: string[];
+  min_amount?: number;
+  max_amount?: number;
+  q?: string;
+  sort_by?: "date" | "amount" | "category";
+  order?: "asc" | "desc";
+  limit?: number;
+  cursor?: string;
+}) => {
+  const res = await API.get("/transactions", {
+    params: filters,
+    paramsSerializer: { indexes: null },
+  });
+  return res.data;
+};
+
+export const uploadFxRates = async (file: File) => {
+  const formData = new FormData();
+  formData.append("file", file);
+  const res = await API.post("/fx-rates", formData);
+  return res.data;
+};
+
+export const setCategoryRules = async (
+  rules: {
+    match?: "exact" | "prefix" | "keyword" | "regex";
+    field?: "category" | "notes";
+    pattern: string;
+    category: string;
+    id?: string;
+  }[]
+) => {
+  const res = await API.post("/category-rules", { rules });
+  return res.data;
+};
+
+export const getDatasets = async () => {
+  const res = await API.get("/datasets");
   return res.data;
-};
\ No newline at end of file
+};
+
+export const getPortfolio = async (options: {
+  dataset_ids?: string[];
+  cash_balances?: Record<string, number>;
+  default_cash_balance?: number;
+  rank_by?: "runway" | "burn" | "anomalies_found";
+  descending?: boolean;
+} = {}) => {
+  const res = await API.post("/portfolio", options);
+  return res.data;
+};
+
+export const getSensitivity = async (request: {
+  new_hires?: number;
+  avg_salary?: number;
+  marketing_change_pct?: number;
+  revenue_growth_pct?: number;
+  additional_monthly_cost?: number;
+  additional_monthly_revenue?: number;
+  cash_balance?: number;
+  bounds?: { lever: string; low: number; high: number }[];
+}) => {
+  const res = await API.post("/sensitivity", request);
+  return res.data;
+};
+
+export const goalSeek = async (request: {
+  target_runway?: number;
+  target_burn?: number;
+  free_variables: string[];
+  bounds?: Record<string, [number, number]>;
+  new_hires?: number;
+  avg_salary?: number;
+  marketing_change_pct?: number;
+  revenue_growth_pct?: number;
+  additional_monthly_cost?: number;
+  additional_monthly_revenue?: number;
+  cash_balance?: number;
+}) => {
+  const res = await API.post("/goal-seek", request);
+  return res.data;
+};
+
+export const getForecast = async (cashBalance?: number, horizon?: number, useHeadcountPlan?: boolean) => {
+  const params: Record<string, number | boolean> = {};
+  if (cashBalance) params.cash_balance = cashBalance;
+  if (horizon) params.horizon = horizon;
+  if (useHeadcountPlan) params.use_headcount_plan = true;
+  const res = await API.get("/forecast", { params });
+  return res.data;
+};
+
+export const getDailyCash = async (cashBalance?: number, horizonDays?: number) => {
+  const params: Record<string, number> = {};
+  if (cashBalance) params.cash_balance = cashBalance;
+  if (horizonDays !== undefined) params.horizon_days = horizonDays;
+  const res = await API.get("/daily-cash", { params });
+  return res.data;
+};
+
+export const getRecurring = async () => {
+  const res = await API.get("/recurring");
+  return res.data;
+};
+
+export type HeadcountRole = {
+  title: string;
+  department?: string;
+  count?: number;
+  start_month: number;
+  end_month?: number;
+  monthly_salary: number;
+  burden_rate?: number;
+};
+
+export const setHeadcountPlan = async (roles: HeadcountRole[], horizonMonths?: number) => {
+  const res = await API.post("/headcount-plan", { roles, horizon_months: horizonMonths });
+  return res.data;
+};
+
+export const getHeadcountPlan = async () => {
+  const res = await API.get("/headcount-plan");
+  return res.data;
+};